@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Streaming progress events for the CSM218 autograder.
+
+Each event is one JSON object per line, written and flushed as it happens,
+so dashboards can follow a run without waiting for results.json.
+"""
+
+import json
+import sys
+import time
+
+
+class EventStream:
+    """Newline-delimited JSON event sink; a no-op when no target is given"""
+
+    def __init__(self, target=None):
+        self.seq = 0
+        self.owned = False
+        if target is None:
+            self.stream = None
+        elif target == "-":
+            # Captured now so later stdout redirection does not affect events
+            self.stream = sys.stdout
+        else:
+            self.stream = open(target, "a", encoding="utf-8", buffering=1)
+            self.owned = True
+
+    @property
+    def enabled(self):
+        return self.stream is not None
+
+    def emit(self, event, **fields):
+        if self.stream is None:
+            return
+        self.seq += 1
+        record = {"event": event, "seq": self.seq, "ts": round(time.time(), 3)}
+        record.update(fields)
+        self.stream.write(json.dumps(record, default=str) + "\n")
+        self.stream.flush()
+
+    def metrics(self, rows, **fields):
+        """One `metric` event per (scenario, metric, value) row"""
+        for scenario, metric, value in rows:
+            self.emit("metric", scenario=scenario, metric=metric, value=value, **fields)
+
+    def close(self):
+        if self.owned and self.stream:
+            self.stream.close()
+        self.stream = None
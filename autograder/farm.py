@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Local grading farm for CSM218: a SQLite job queue plus grader daemons.
+
+Jobs name a submission directory (and optional grade.py arguments). Each
+daemon claims one job at a time under a lease, runs grade.py for it in a
+separate process with its own output directory and port range, and renews
+the lease while the grade runs. Jobs whose daemon dies are reclaimed when
+their lease expires and retried up to max_attempts. Throughput scales by
+starting more daemons against the same database.
+
+Usage:
+    python autograder/farm.py enqueue SUBMISSION_DIR... [--max-attempts 3] [--grade-args ARGS...]
+    python autograder/farm.py daemon [--name NAME] [--lease 120] [--once]
+    python autograder/farm.py status
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+AUTOGRADER_DIR = os.path.dirname(os.path.abspath(__file__))
+GRADE_SCRIPT = os.path.join(AUTOGRADER_DIR, "grade.py")
+DEFAULT_FARM_DIR = os.path.join(AUTOGRADER_DIR, "results", "farm")
+DEFAULT_DB_PATH = os.path.join(DEFAULT_FARM_DIR, "farm.sqlite")
+
+DEFAULT_LEASE_S = 120
+# Time grade.py gets after SIGTERM to stop its harness JVMs before SIGKILL
+STOP_GRACE_S = 30
+DEFAULT_JOB_TIMEOUT_S = 900
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Each daemon slot gets PORT_STRIDE ports starting here (CSM218_PORT_BASE)
+PORT_RANGE_START = 20000
+PORT_STRIDE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    submission_dir TEXT NOT NULL,
+    grade_args TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    exit_code INTEGER,
+    score REAL,
+    output_dir TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS daemons (
+    name TEXT PRIMARY KEY,
+    slot INTEGER NOT NULL,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+# queued -> running -> done | failed; running -> queued again on a retry
+STATUSES = ("queued", "running", "done", "failed")
+
+
+class JobQueue:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # Autocommit mode: writes that must be atomic use BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def transaction(self):
+        """Write lock held until commit, so two daemons never claim the same job"""
+        return _Transaction(self.conn)
+
+    def enqueue(self, submission_dir, grade_args=(), max_attempts=DEFAULT_MAX_ATTEMPTS):
+        cur = self.conn.execute(
+            "INSERT INTO jobs (submission_dir, grade_args, status, max_attempts, enqueued_at) "
+            "VALUES (?, ?, 'queued', ?, ?)",
+            (os.path.abspath(submission_dir), json.dumps(list(grade_args)), max_attempts, time.time()),
+        )
+        return cur.lastrowid
+
+    def reclaim_expired(self, now):
+        """Requeue (or give up on) running jobs whose daemon stopped renewing"""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+            "error = 'lease expired (owner ' || lease_owner || ')', lease_owner = NULL, lease_expires = NULL, "
+            "finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END "
+            "WHERE status = 'running' AND lease_expires < ?",
+            (now, now),
+        )
+
+    def claim(self, owner, lease_s=DEFAULT_LEASE_S):
+        """Lease the oldest queued job; returns the job row as a dict or None"""
+        now = time.time()
+        with self.transaction():
+            self.reclaim_expired(now)
+            row = self.conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, started_at = ? WHERE id = ?",
+                (owner, now + lease_s, now, row[0]),
+            )
+        return self.get(row[0])
+
+    def renew(self, job_id, owner, lease_s=DEFAULT_LEASE_S):
+        """Extend a lease; False if the job is no longer ours"""
+        cur = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time() + lease_s, job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id, owner, exit_code, score, output_dir):
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'done', exit_code = ?, score = ?, output_dir = ?, error = NULL, "
+            "finished_at = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (exit_code, score, output_dir, time.time(), job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id, owner, error, exit_code=None):
+        """Record a failed attempt; the job is retried until max_attempts"""
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+            "finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END, "
+            "error = ?, exit_code = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time(), error, exit_code, job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def get(self, job_id):
+        cur = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        row = cur.fetchone()
+        return dict(zip([c[0] for c in cur.description], row)) if row else None
+
+    def counts(self):
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, n in self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = n
+        return counts
+
+    def recent(self, limit=20):
+        cur = self.conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        names = [c[0] for c in cur.description]
+        return [dict(zip(names, row)) for row in cur.fetchall()]
+
+    def register_daemon(self, name, stale_s):
+        """Take the lowest daemon slot not held by a live daemon; returns the slot"""
+        now = time.time()
+        with self.transaction():
+            self.conn.execute("DELETE FROM daemons WHERE heartbeat < ? OR name = ?", (now - stale_s, name))
+            taken = {slot for (slot,) in self.conn.execute("SELECT slot FROM daemons")}
+            slot = next(i for i in range(len(taken) + 1) if i not in taken)
+            self.conn.execute(
+                "INSERT INTO daemons (name, slot, host, pid, heartbeat) VALUES (?, ?, ?, ?, ?)",
+                (name, slot, socket.gethostname(), os.getpid(), now),
+            )
+        return slot
+
+    def heartbeat(self, name):
+        self.conn.execute("UPDATE daemons SET heartbeat = ? WHERE name = ?", (time.time(), name))
+
+    def unregister_daemon(self, name):
+        self.conn.execute("DELETE FROM daemons WHERE name = ?", (name,))
+
+    def daemons(self):
+        return self.conn.execute("SELECT name, slot, host, pid, heartbeat FROM daemons ORDER BY slot").fetchall()
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+class GradingDaemon:
+    def __init__(self, queue, name=None, farm_dir=DEFAULT_FARM_DIR, lease_s=DEFAULT_LEASE_S,
+                 poll_s=1.0, job_timeout=DEFAULT_JOB_TIMEOUT_S):
+        self.queue = queue
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.farm_dir = farm_dir
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.job_timeout = job_timeout
+        self.port_base = None
+
+    def job_env(self, job, output_dir):
+        env = os.environ.copy()
+        env["CSM218_SUBMISSION_DIR"] = job["submission_dir"]
+        env["CSM218_OUTPUT_DIR"] = output_dir
+        env["CSM218_PORT_BASE"] = str(self.port_base)
+        return env
+
+    def stop_job(self, proc):
+        """
+        SIGTERM the job's process group so grade.py can unwind and its harness
+        kill the JVM process groups it started; SIGKILL whatever is left after
+        the grace period.
+        """
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            proc.wait(timeout=STOP_GRACE_S)
+        except subprocess.TimeoutExpired:
+            print(f"[FARM] {self.name}: grade.py ignored SIGTERM for {STOP_GRACE_S}s, killing")
+        except ProcessLookupError:
+            pass
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+
+    def run_job(self, job):
+        """Grade one job in its own process, renewing the lease while it runs"""
+        output_dir = os.path.join(self.farm_dir, "jobs", f"job-{job['id']}")
+        # A retry starts from a clean output directory
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.makedirs(output_dir, exist_ok=True)
+        log_path = os.path.join(output_dir, "grade.log")
+
+        cmd = [sys.executable, GRADE_SCRIPT] + json.loads(job["grade_args"])
+        print(f"[FARM] {self.name}: job {job['id']} attempt {job['attempts']} ({job['submission_dir']})")
+
+        with open(log_path, "w", encoding="utf-8") as log:
+            proc = subprocess.Popen(cmd, cwd=job["submission_dir"], env=self.job_env(job, output_dir),
+                                    stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            begin = time.time()
+            renew_every = self.lease_s / 3
+            next_renew = begin + renew_every
+            error = None
+
+            try:
+                while proc.poll() is None:
+                    time.sleep(min(1.0, renew_every))
+                    now = time.time()
+                    if now - begin > self.job_timeout:
+                        error = f"timed out after {self.job_timeout}s"
+                    elif now >= next_renew:
+                        self.queue.heartbeat(self.name)
+                        if not self.queue.renew(job["id"], self.name, self.lease_s):
+                            error = "lease lost"
+                        next_renew = now + renew_every
+                    if error:
+                        self.stop_job(proc)
+                        break
+            except BaseException:
+                # Daemon interrupted (SIGINT/SIGTERM): never leave an orphaned
+                # grade writing into a directory the next claim will wipe
+                self.stop_job(proc)
+                self.queue.fail(job["id"], self.name, "daemon stopped")
+                raise
+
+        if error == "lease lost":
+            # Another daemon may already own the job; leave its record alone
+            print(f"[FARM] {self.name}: job {job['id']} lease lost, abandoning")
+            return False
+        if error:
+            self.queue.fail(job["id"], self.name, error)
+            print(f"[FARM] {self.name}: job {job['id']} {error}")
+            return False
+
+        # grade.py exits 1 for a failing grade too; only a missing result is an error
+        results_path = os.path.join(output_dir, "results.json")
+        try:
+            with open(results_path, "r") as f:
+                score = json.load(f).get("score")
+        except (OSError, ValueError) as e:
+            self.queue.fail(job["id"], self.name, f"no results (exit {proc.returncode}): {e}", proc.returncode)
+            print(f"[FARM] {self.name}: job {job['id']} produced no results (exit {proc.returncode})")
+            return False
+
+        if not self.queue.complete(job["id"], self.name, proc.returncode, score, output_dir):
+            # The lease expired during the last renew interval; the job belongs to someone else now
+            print(f"[FARM] {self.name}: job {job['id']} finished after its lease was lost, result discarded")
+            return False
+        print(f"[FARM] {self.name}: job {job['id']} done, score {score}")
+        return True
+
+    def run(self, once=False):
+        """Claim and grade jobs until interrupted (or the queue is empty with `once`)"""
+        # SIGTERM takes the same path as Ctrl-C: stop the running job, then exit
+        signal.signal(signal.SIGTERM, interrupt)
+        slot = self.queue.register_daemon(self.name, stale_s=self.lease_s)
+        self.port_base = PORT_RANGE_START + slot * PORT_STRIDE
+        print(f"[FARM] {self.name}: slot {slot}, ports {self.port_base}-{self.port_base + PORT_STRIDE - 1}")
+
+        try:
+            while True:
+                self.queue.heartbeat(self.name)
+                job = self.queue.claim(self.name, self.lease_s)
+                if job is None:
+                    if once:
+                        return
+                    time.sleep(self.poll_s)
+                    continue
+                self.run_job(job)
+        except KeyboardInterrupt:
+            print(f"[FARM] {self.name}: stopping")
+        finally:
+            self.queue.unregister_daemon(self.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSM218 local grading farm")
+    parser.add_argument("--db", default=os.environ.get("CSM218_FARM_DB", DEFAULT_DB_PATH), help="SQLite queue path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Queue submissions for grading")
+    enqueue.add_argument("submissions", nargs="+", help="Submission directories")
+    enqueue.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="Attempts before a job fails")
+    enqueue.add_argument("--grade-args", nargs=argparse.REMAINDER, default=[],
+                         help="Arguments passed to grade.py (must come last)")
+
+    daemon = sub.add_parser("daemon", help="Claim and grade jobs")
+    daemon.add_argument("--name", help="Daemon name (default: host-pid)")
+    daemon.add_argument("--farm-dir", default=DEFAULT_FARM_DIR, help="Directory for per-job output")
+    daemon.add_argument("--lease", type=float, default=DEFAULT_LEASE_S, help="Lease length in seconds")
+    daemon.add_argument("--poll", type=float, default=1.0, help="Seconds between polls of an empty queue")
+    daemon.add_argument("--job-timeout", type=float, default=DEFAULT_JOB_TIMEOUT_S, help="Seconds before a grade is killed")
+    daemon.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+
+    sub.add_parser("status", help="Show queue counts, daemons and recent jobs")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.db)
+    try:
+        if args.command == "enqueue":
+            # Validate everything first so a typo never leaves a partial batch queued
+            missing = [s for s in args.submissions if not os.path.isdir(s)]
+            if missing:
+                print(f"Not a directory: {', '.join(missing)} (grade.py arguments go after --grade-args)")
+                return 1
+            for submission in args.submissions:
+                job_id = queue.enqueue(submission, args.grade_args, args.max_attempts)
+                print(f"Queued job {job_id}: {os.path.abspath(submission)}")
+
+        elif args.command == "daemon":
+            GradingDaemon(queue, args.name, args.farm_dir, args.lease, args.poll, args.job_timeout).run(args.once)
+
+        elif args.command == "status":
+            counts = queue.counts()
+            print("  ".join(f"{status}: {counts[status]}" for status in STATUSES))
+            for name, slot, host, pid, heartbeat in queue.daemons():
+                print(f"daemon {name} (slot {slot}, {host} pid {pid}, seen {time.time() - heartbeat:.0f}s ago)")
+            for job in queue.recent():
+                score = "" if job["score"] is None else f"score {job['score']}"
+                error = f"({job['error']})" if job["error"] else ""
+                print(f"{job['id']:5d}  {job['status']:8s}  attempt {job['attempts']}/{job['max_attempts']}  "
+                      f"{job['submission_dir']}  {score} {error}".rstrip())
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,11 @@
 import json
 import sys
 import os
+import importlib
 import shutil
+import signal
 import subprocess
+import time
 from pathlib import Path
 
 import argparse
@@ -18,28 +21,39 @@ if sys.stdout.encoding.lower() != 'utf-8':
         import codecs
         sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
 
-# Import test modules
+# Suites live in tests/, benchmark drivers in harness/
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tests'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'harness'))
 
-from test_rpc_basic import AutograderTest
-from test_parallel_execution import ParallelExecutionTest
-from test_failure_handling import FailureHandlingTest
-from test_protocol_structure import ProtocolStructureTest
-from test_concurrency import ConcurrencyTest
-from test_advanced_protocol import AdvancedProtocolTest
-
-# Hidden Test Detection (Only runs if injected during CI)
-HIDDEN_TEST_AVAILABLE = False
-try:
-    from test_hidden_robustness import HiddenRobustnessTest
-    HIDDEN_TEST_AVAILABLE = True
-except ImportError:
-    pass
+# Suite modules (including the hidden one injected during CI) are
+# discovered by name and only imported when selected
+from suites import SuiteRegistry
+from result_cache import SuiteResultCache
+from events import EventStream
+from watchdog import DEADLINE_ENV
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+def load_config():
+    with open(CONFIG_PATH, 'r') as f:
+        return json.load(f)['autograder_config']
+
+# Optional benchmarks (not graded): name -> (harness module, class)
+BENCHMARKS = {
+    "message": ("message_benchmark", "MessageBenchmark"),
+    "coordinate": ("coordinate_benchmark", "CoordinateBenchmark"),
+    "jvm": ("jvm_matrix", "JvmMatrixBenchmark"),
+}
 
 class Grader:
-    def __init__(self):
+    def __init__(self, use_cache=True, record_history=True, events=None):
         self.results = {}
+        self.use_cache = use_cache
+        self.record_history = record_history
+        self.events = events or EventStream()
         self.total_score = 0.0
+        self.deadline = None
+        self.skipped = []
         
         # Determine repository root and environment
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -53,9 +67,30 @@ class Grader:
             # Regular GitHub Actions or local runs: use repository root
             self.submission_dir = repo_root
             self.output_dir = os.path.join(repo_root, "autograder", "results")
+        
+        # Grading farm jobs (farm.py) point each run at its own submission and output directories
+        self.submission_dir = os.path.abspath(os.environ.get("CSM218_SUBMISSION_DIR", self.submission_dir))
+        self.output_dir = os.path.abspath(os.environ.get("CSM218_OUTPUT_DIR", self.output_dir))
 
         self.output_path = os.path.join(self.output_dir, "results.json")
+        self.cache_path = os.path.join(self.output_dir, "cache", "suite_results.json")
+        self.history_path = os.environ.get("CSM218_HISTORY_DB", os.path.join(self.output_dir, "history.sqlite"))
         
+    def remaining(self):
+        """Seconds left before the run deadline (None when unbounded)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+    
+    def deadline_passed(self, what):
+        """True (and `what` is recorded as skipped) once the run deadline has passed"""
+        if self.deadline is None or time.time() < self.deadline:
+            return False
+        print(f"[DEADLINE] Run budget exhausted; skipping {what}")
+        self.skipped.append(what)
+        self.events.emit("skipped", item=what, reason="deadline")
+        return True
+    
     def compile_code(self):
         """Compile student and reference code"""
         repo_root = self.submission_dir
@@ -86,7 +121,8 @@ class Grader:
             return False
 
         try:
-            proc = subprocess.run(cmd, cwd=repo_root, capture_output=True, timeout=300, text=True, shell=shell)
+            timeout = 300 if self.deadline is None else min(300, self.remaining())
+            proc = subprocess.run(cmd, cwd=repo_root, capture_output=True, timeout=timeout, text=True, shell=shell)
             # write log always for visibility
             with open(gradle_log_path, 'w', encoding='utf-8') as f:
                 f.write(proc.stdout or '')
@@ -109,27 +145,35 @@ class Grader:
     
     def run_tests(self, filter_suite=None, filter_type=None):
         """Run all or specific test suites"""
-        test_suites = [
-            ("RPC", AutograderTest()),
-            ("Parallel", ParallelExecutionTest()),
-            ("Failure", FailureHandlingTest()),
-            ("Protocol", ProtocolStructureTest()),
-            ("Concurrency", ConcurrencyTest()),
-            ("Advanced", AdvancedProtocolTest()),
-        ]
-        
-        if HIDDEN_TEST_AVAILABLE:
-            test_suites.append(("SystemConsistency", HiddenRobustnessTest()))
-        
-        if filter_suite:
-            test_suites = [s for s in test_suites if s[0] == filter_suite]
+        registry = SuiteRegistry()
+        test_suites = registry.select(filter_suite)
+        if filter_suite and not test_suites:
+            print(f"Unknown suite '{filter_suite}'. Available: {', '.join(registry.names())}")
         
         all_results = {}
         all_weights = {}
+        cache = SuiteResultCache(self.cache_path, self.submission_dir) if self.use_cache else None
         
-        for suite_name, tester in test_suites:
+        for spec in test_suites:
+            suite_name = spec.name
+            if self.deadline_passed(f"suite {suite_name}"):
+                continue
             print(f"\n--- {suite_name} ---")
-            results = tester.run_all()
+            self.events.emit("suite_start", suite=suite_name)
+            suite_start = time.time()
+            results = None
+            cached = False
+            if cache:
+                cache_key = cache.key_for(suite_name, spec.path)
+                results = cache.get(suite_name, cache_key)
+                if results is not None:
+                    cached = True
+                    print(f"[CACHE] {suite_name} inputs unchanged, reusing previous results")
+            
+            if results is None:
+                results = spec.load().run_all()
+                if cache:
+                    cache.put(suite_name, cache_key, results)
             
             for test_name, test_result in results.items():
                 is_static = test_result.get("type") == "static" or "compilation" in test_name or "schema" in test_name or "framework" in test_name or "variable" in test_name or "support" in test_name or "collection" in test_name or "format" in test_name or "serialization" in test_name
@@ -150,9 +194,42 @@ class Grader:
                 
                 all_results[full_name] = test_result["passed"]
                 all_weights[full_name] = test_result.get("weight", 0)
+                self.events.emit("test_finish", suite=suite_name, test=test_name, passed=test_result["passed"],
+                                 message=test_result["message"], weight=test_result.get("weight", 0))
+            
+            self.events.emit("suite_finish", suite=suite_name, cached=cached,
+                             passed=sum(1 for r in results.values() if r["passed"]), total=len(results),
+                             duration_s=round(time.time() - suite_start, 3))
+        
+        if cache:
+            cache.save()
         
         return all_results, all_weights
     
+    def run_benchmarks(self, names):
+        """Run the requested benchmarks; results are reported but never scored"""
+        benchmarks = {}
+        
+        for name in names:
+            if self.deadline_passed(f"benchmark {name}"):
+                continue
+            print(f"\n--- Benchmark: {name} ---")
+            self.events.emit("benchmark_start", benchmark=name)
+            module_name, class_name = BENCHMARKS[name]
+            try:
+                benchmark_cls = getattr(importlib.import_module(module_name), class_name)
+                benchmarks[name] = benchmark_cls().run_all()
+            except Exception as e:
+                print(f"[BENCH] {name} failed: {e}")
+                benchmarks[name] = {"scenarios": {}, "errors": [str(e)]}
+            
+            if self.events.enabled:
+                from history import collect_metrics
+                self.events.metrics(collect_metrics({"benchmarks": {name: benchmarks[name]}}), benchmark=name)
+            self.events.emit("benchmark_finish", benchmark=name, errors=benchmarks[name].get("errors", []))
+        
+        return benchmarks
+    
     def calculate_score(self, results, weights):
         """Calculate weighted score"""
         total_weight = sum(weights.values())
@@ -167,15 +244,31 @@ class Grader:
         score = (weighted_score / total_weight * 100) if total_weight > 0 else 0
         return score
     
-    def run(self, filter_suite=None, filter_type=None):
+    def run(self, filter_suite=None, filter_type=None, benchmarks=None):
         """Execute full autograding pipeline"""
         # Change to repo root to ensure relative paths in tests work correctly
         os.chdir(self.submission_dir)
         
         print(f"=== CSM218 Autograder {'['+filter_suite+']' if filter_suite else ''} {'('+filter_type+')' if filter_type else ''} ===\n")
         
+        run_start = time.time()
+        timings = {}
+        # One wall-clock budget for compiling and grading, and a separate one for
+        # the (never scored) benchmarks afterwards. Harness scenarios and benchmark
+        # subprocesses read the current deadline and cap their timeouts accordingly
+        config = load_config()
+        budget_s = config['timeout_seconds']
+        self.deadline = run_start + budget_s
+        os.environ[DEADLINE_ENV] = str(self.deadline)
+        self.events.emit("run_start", suite=filter_suite, type=filter_type, benchmarks=benchmarks or [])
+        
         # Compile code
-        if not self.compile_code():
+        phase_start = time.time()
+        self.events.emit("phase_start", phase="compile")
+        compiled = self.compile_code()
+        timings["compile_s"] = round(time.time() - phase_start, 3)
+        self.events.emit("phase_finish", phase="compile", duration_s=timings["compile_s"], ok=compiled)
+        if not compiled:
             score = 0.0
             results = {
                 "score": score,
@@ -183,31 +276,64 @@ class Grader:
                 "message": "Compilation failed"
             }
             self.output_results(results)
+            self.events.emit("run_finish", status="FAILED", score=score)
             sys.exit(1)
         
         # Run tests
+        phase_start = time.time()
+        self.events.emit("phase_start", phase="tests")
         try:
             test_results, test_weights = self.run_tests(filter_suite, filter_type)
         except Exception as e:
             print(f"Error running tests: {e}")
             test_results = {}
             test_weights = {}
+        timings["tests_s"] = round(time.time() - phase_start, 3)
+        self.events.emit("phase_finish", phase="tests", duration_s=timings["tests_s"],
+                         passed=sum(1 for p in test_results.values() if p), total=len(test_results))
         
         # Calculate score
         final_score = self.calculate_score(test_results, test_weights)
-        
-        # Determine status
-        status = "PASS" if final_score >= 60.0 else "FAIL"
+        graded_skipped = list(self.skipped)
         
         results = {
             "score": round(final_score, 2),
-            "status": status,
             "test_results": test_results,
             "test_weights": test_weights,
-            "message": f"Final Score: {final_score:.2f}%"
         }
         
+        if benchmarks:
+            benchmark_budget_s = config['benchmark_timeout_seconds']
+            self.deadline = time.time() + benchmark_budget_s
+            os.environ[DEADLINE_ENV] = str(self.deadline)
+            phase_start = time.time()
+            self.events.emit("phase_start", phase="benchmarks")
+            results["benchmarks"] = self.run_benchmarks(benchmarks)
+            timings["benchmarks_s"] = round(time.time() - phase_start, 3)
+            self.events.emit("phase_finish", phase="benchmarks", duration_s=timings["benchmarks_s"])
+            results["benchmark_deadline_s"] = benchmark_budget_s
+            results["benchmarks_skipped"] = self.skipped[len(graded_skipped):]
+        
+        # Determine status once every phase has run; a run that hit its grading
+        # deadline is incomplete and never passes. Benchmarks are not graded,
+        # so running out of their budget does not change the status
+        status = "PASS" if final_score >= 60.0 and not graded_skipped else "FAIL"
+        results["status"] = status
+        results["message"] = f"Final Score: {final_score:.2f}%"
+        if graded_skipped:
+            results["message"] += f" (deadline of {budget_s}s exceeded)"
+        
+        timings["total_s"] = round(time.time() - run_start, 3)
+        results["timings"] = timings
+        results["deadline_s"] = budget_s
+        results["deadline_exceeded"] = bool(graded_skipped)
+        results["skipped"] = graded_skipped
+        
         self.output_results(results)
+        self.events.emit("run_finish", status=status, score=results["score"], timings=timings)
+        # Filtered Classroom invocations are partial runs; keep them out of the history
+        if self.record_history and (benchmarks or not (filter_suite or filter_type)):
+            self.save_history(results)
         print(f"\nStatus: {status}")
         print(f"=== Score for this section: {final_score:.2f}% ===")
         
@@ -226,13 +352,69 @@ class Grader:
             json.dump(results, f, indent=2)
         
         print(f"Results written to {self.output_path}")
+    
+    def save_history(self, results):
+        """Append this run's timings and benchmark metrics to the performance history"""
+        try:
+            from history import PerformanceHistory, current_commit
+            history = PerformanceHistory(self.history_path)
+            try:
+                run_id = history.record_run(results, current_commit(self.submission_dir), source="grade")
+            finally:
+                history.close()
+            print(f"Performance history updated (run {run_id}, {self.history_path})")
+        except Exception as e:
+            print(f"Could not update performance history: {e}")
+
+def check_startup(runs=5):
+    """Measure `grade.py --list` wall time against the configured startup budget"""
+    budget_ms = load_config()['startup_budget_ms']
+    
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--list'], capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    median_ms = sorted(samples)[len(samples) // 2]
+    
+    status = "PASS" if median_ms <= budget_ms else "FAIL"
+    print(f"[{status}] startup: median {median_ms:.0f} ms over {runs} runs (budget {budget_ms} ms)")
+    return median_ms <= budget_ms
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description='CSM218 Autograder')
-    parser.add_argument('--suite', type=str, help='Run a specific test suite (RPC, Parallel, Failure, Protocol, Concurrency, Advanced)')
+    parser.add_argument('--suite', type=str, help='Run a specific test suite (see --list)')
+    parser.add_argument('--list', action='store_true', help='List available test suites and exit')
+    parser.add_argument('--check-startup', action='store_true', help='Check grade.py startup time against config.json startup_budget_ms and exit')
     parser.add_argument('--type', type=str, choices=['static', 'dynamic'], help='Filter by test type')
+    parser.add_argument('--no-cache', action='store_true', help='Re-run every suite, ignoring cached results')
+    parser.add_argument('--benchmark', action='append', choices=sorted(BENCHMARKS), help='Also run a benchmark and store it in results.json (repeatable)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record this run in the performance history')
+    parser.add_argument('--events', type=str, metavar='PATH', help="Stream progress as JSON lines to PATH ('-' for stdout; other output then goes to stderr)")
     args = parser.parse_args()
     
-    grader = Grader()
-    grader.run(filter_suite=args.suite, filter_type=args.type)
+    if args.list:
+        for name, spec in SuiteRegistry().suites.items():
+            print(f"{name:20s} {spec.module}.{spec.class_name}")
+        sys.exit(0)
+    
+    if args.check_startup:
+        sys.exit(0 if check_startup() else 1)
+    
+    # farm.py stops a job with SIGTERM before SIGKILL; exiting through the
+    # normal unwinding lets harness cleanup kill the JVM process groups
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    
+    events = EventStream(args.events)
+    grader = Grader(use_cache=not args.no_cache, record_history=not args.no_history, events=events)
+    try:
+        if args.events == '-':
+            # Keep stdout pure JSON lines; the usual log moves to stderr
+            import contextlib
+            with contextlib.redirect_stdout(sys.stderr):
+                grader.run(filter_suite=args.suite, filter_type=args.type, benchmarks=args.benchmark)
+        else:
+            grader.run(filter_suite=args.suite, filter_type=args.type, benchmarks=args.benchmark)
+    finally:
+        events.close()
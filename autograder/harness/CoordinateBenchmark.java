@@ -0,0 +1,111 @@
+package pdc;
+
+import java.util.Arrays;
+
+/**
+ * In-process scaling driver for Master.coordinate().
+ *
+ * Usage: java pdc.CoordinateBenchmark <operation> <sizes> <workerCounts> <repetitions>
+ * where sizes and workerCounts are comma-separated lists.
+ *
+ * For every (size, workerCount) pair the square matrix A is multiplied by
+ * itself through coordinate() and compared to a single-threaded reference.
+ * Prints one JSON line per pair; times are medians in nanoseconds.
+ */
+public class CoordinateBenchmark {
+
+    public static void main(String[] args) {
+        String operation = args[0];
+        int[] sizes = parseList(args[1]);
+        int[] workerCounts = parseList(args[2]);
+        int repetitions = Integer.parseInt(args[3]);
+
+        for (int n : sizes) {
+            int[][] a = MatrixGenerator.generateRandomMatrix(n, n, 10);
+
+            int[][] expected = multiply(a, a);
+            long[] referenceTimes = new long[repetitions];
+            for (int r = 0; r < repetitions; r++) {
+                long start = System.nanoTime();
+                multiply(a, a);
+                referenceTimes[r] = System.nanoTime() - start;
+            }
+            long referenceNanos = median(referenceTimes);
+
+            for (int workers : workerCounts) {
+                runCase(operation, a, expected, workers, repetitions, referenceNanos);
+            }
+        }
+
+        // Submissions may leave non-daemon pool threads behind
+        System.exit(0);
+    }
+
+    private static void runCase(String operation, int[][] a, int[][] expected, int workers,
+            int repetitions, long referenceNanos) {
+        String prefix = "{\"size\":" + a.length + ",\"workers\":" + workers
+                + ",\"reference_nanos\":" + referenceNanos;
+        try {
+            // Warmup call doubles as the correctness check
+            Object result = new Master().coordinate(operation, a, workers);
+            String verdict = verify(result, expected);
+
+            long[] times = new long[repetitions];
+            for (int r = 0; r < repetitions; r++) {
+                Master master = new Master();
+                long start = System.nanoTime();
+                master.coordinate(operation, a, workers);
+                times[r] = System.nanoTime() - start;
+            }
+
+            System.out.println(prefix
+                    + ",\"coordinate_nanos\":" + median(times)
+                    + ",\"correct\":" + (verdict == null)
+                    + (verdict == null ? "" : ",\"note\":\"" + verdict + "\"") + "}");
+        } catch (Throwable t) {
+            System.out.println(prefix + ",\"error\":\"" + escape(t.toString()) + "\"}");
+        }
+    }
+
+    private static String verify(Object result, int[][] expected) {
+        if (result == null) {
+            return "coordinate returned null";
+        }
+        if (!(result instanceof int[][])) {
+            return "unexpected result type " + result.getClass().getSimpleName();
+        }
+        return Arrays.deepEquals((int[][]) result, expected) ? null : "result differs from reference";
+    }
+
+    /** Single-threaded i-k-j reference multiply. */
+    static int[][] multiply(int[][] a, int[][] b) {
+        int n = a.length;
+        int m = b[0].length;
+        int[][] c = new int[n][m];
+        for (int i = 0; i < n; i++) {
+            int[] ci = c[i];
+            for (int k = 0; k < b.length; k++) {
+                int aik = a[i][k];
+                int[] bk = b[k];
+                for (int j = 0; j < m; j++) {
+                    ci[j] += aik * bk[j];
+                }
+            }
+        }
+        return c;
+    }
+
+    private static long median(long[] values) {
+        long[] sorted = values.clone();
+        Arrays.sort(sorted);
+        return sorted[sorted.length / 2];
+    }
+
+    private static int[] parseList(String csv) {
+        return Arrays.stream(csv.split(",")).mapToInt(Integer::parseInt).toArray();
+    }
+
+    private static String escape(String s) {
+        return s.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", " ");
+    }
+}
@@ -0,0 +1,114 @@
+package pdc;
+
+import java.nio.file.Paths;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import jdk.jfr.consumer.RecordedClass;
+import jdk.jfr.consumer.RecordedEvent;
+import jdk.jfr.consumer.RecordedFrame;
+import jdk.jfr.consumer.RecordedMethod;
+import jdk.jfr.consumer.RecordedStackTrace;
+import jdk.jfr.consumer.RecordingFile;
+
+/**
+ * Condenses a Java Flight Recorder file into aggregated JSON lines for the
+ * Python summarizer (JDK 11 has no `jfr` command-line tool).
+ *
+ * Usage: java pdc.JfrExport <recording.jfr>
+ *
+ * Each line aggregates one (kind, subject, top frame, first pdc frame) key:
+ * kind is "exec" (execution samples), "lock" (monitor enter / thread park)
+ * or "alloc" (TLAB and outside-TLAB allocations).
+ */
+public class JfrExport {
+
+    public static void main(String[] args) throws Exception {
+        Map<String, long[]> totals = new HashMap<>();
+
+        try (RecordingFile recording = new RecordingFile(Paths.get(args[0]))) {
+            while (recording.hasMoreEvents()) {
+                RecordedEvent event = recording.readEvent();
+                switch (event.getEventType().getName()) {
+                    case "jdk.ExecutionSample":
+                        add(totals, key("exec", "", event), 0);
+                        break;
+                    case "jdk.JavaMonitorEnter":
+                        add(totals, key("lock", className(event, "monitorClass"), event),
+                                event.getDuration().toNanos());
+                        break;
+                    case "jdk.ThreadPark":
+                        add(totals, key("lock", className(event, "parkedClass"), event),
+                                event.getDuration().toNanos());
+                        break;
+                    case "jdk.ObjectAllocationInNewTLAB":
+                        add(totals, key("alloc", className(event, "objectClass"), event), event.getLong("tlabSize"));
+                        break;
+                    case "jdk.ObjectAllocationOutsideTLAB":
+                        add(totals, key("alloc", className(event, "objectClass"), event),
+                                event.getLong("allocationSize"));
+                        break;
+                    default:
+                        break;
+                }
+            }
+        }
+
+        for (Map.Entry<String, long[]> entry : totals.entrySet()) {
+            String[] parts = entry.getKey().split("\t", -1);
+            System.out.println("{\"kind\":\"" + parts[0] + "\""
+                    + ",\"subject\":\"" + escape(parts[1]) + "\""
+                    + ",\"top_frame\":\"" + escape(parts[2]) + "\""
+                    + ",\"pdc_frame\":\"" + escape(parts[3]) + "\""
+                    + ",\"count\":" + entry.getValue()[0]
+                    + ",\"amount\":" + entry.getValue()[1] + "}");
+        }
+    }
+
+    private static String key(String kind, String subject, RecordedEvent event) {
+        String top = "<unknown>";
+        String pdc = "";
+        RecordedStackTrace stack = event.getStackTrace();
+        if (stack != null) {
+            List<RecordedFrame> frames = stack.getFrames();
+            for (int i = 0; i < frames.size(); i++) {
+                String name = methodName(frames.get(i));
+                if (i == 0) {
+                    top = name;
+                }
+                if (name.startsWith("pdc.")) {
+                    pdc = name;
+                    break;
+                }
+            }
+        }
+        return kind + "\t" + subject + "\t" + top + "\t" + pdc;
+    }
+
+    private static String methodName(RecordedFrame frame) {
+        RecordedMethod method = frame.getMethod();
+        if (method == null) {
+            return "<unknown>";
+        }
+        return method.getType().getName() + "." + method.getName();
+    }
+
+    private static String className(RecordedEvent event, String field) {
+        if (!event.hasField(field)) {
+            return "";
+        }
+        RecordedClass cls = event.getValue(field);
+        return cls == null ? "" : cls.getName();
+    }
+
+    private static void add(Map<String, long[]> totals, String key, long amount) {
+        long[] value = totals.computeIfAbsent(key, k -> new long[2]);
+        value[0]++;
+        value[1] += amount;
+    }
+
+    private static String escape(String s) {
+        return s.replace("\\", "\\\\").replace("\"", "\\\"");
+    }
+}
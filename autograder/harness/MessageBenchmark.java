@@ -0,0 +1,96 @@
+package pdc;
+
+import java.nio.ByteBuffer;
+
+/**
+ * Timing driver for Message.pack()/unpack().
+ *
+ * Usage: java pdc.MessageBenchmark <payloadBytes> <iterations> <warmupIterations>
+ *
+ * Phases are separated by explicit System.gc() calls so that the GC log can be
+ * split into warmup / pack / unpack segments for allocation accounting.
+ * Prints a single JSON line with the measured timings.
+ */
+public class MessageBenchmark {
+    private static volatile long sink;
+
+    public static void main(String[] args) {
+        int payloadBytes = Integer.parseInt(args[0]);
+        int iterations = Integer.parseInt(args[1]);
+        int warmup = Integer.parseInt(args[2]);
+
+        Message msg = new Message();
+        msg.magic = "CSM218";
+        msg.version = 1;
+        msg.type = "RPC_REQUEST";
+        msg.sender = "autograder-bench";
+        msg.timestamp = System.currentTimeMillis();
+        msg.payload = matrixPayload(payloadBytes);
+
+        byte[] packed;
+        try {
+            packed = msg.pack();
+            Message roundTrip = Message.unpack(packed);
+            if (packed == null || roundTrip == null) {
+                fail(payloadBytes, "pack() or unpack() returned null");
+                return;
+            }
+            for (int i = 0; i < warmup; i++) {
+                packed = msg.pack();
+                sink += Message.unpack(packed).timestamp;
+            }
+        } catch (Throwable t) {
+            fail(payloadBytes, t.toString());
+            return;
+        }
+
+        System.gc();
+        long start = System.nanoTime();
+        for (int i = 0; i < iterations; i++) {
+            packed = msg.pack();
+            sink += packed.length;
+        }
+        long packNanos = System.nanoTime() - start;
+
+        System.gc();
+        start = System.nanoTime();
+        for (int i = 0; i < iterations; i++) {
+            sink += Message.unpack(packed).timestamp;
+        }
+        long unpackNanos = System.nanoTime() - start;
+        System.gc();
+
+        System.out.println("{\"payload_bytes\":" + payloadBytes
+                + ",\"packed_bytes\":" + packed.length
+                + ",\"iterations\":" + iterations
+                + ",\"pack_nanos\":" + packNanos
+                + ",\"unpack_nanos\":" + unpackNanos + "}");
+    }
+
+    /**
+     * Builds a payload of exactly payloadBytes from a square random matrix,
+     * encoded as big-endian ints.
+     */
+    private static byte[] matrixPayload(int payloadBytes) {
+        int ints = (payloadBytes + 3) / 4;
+        int n = (int) Math.ceil(Math.sqrt(ints));
+        int[][] matrix = MatrixGenerator.generateRandomMatrix(n, n, 1000);
+
+        ByteBuffer buffer = ByteBuffer.allocate(payloadBytes);
+        outer:
+        for (int[] row : matrix) {
+            for (int value : row) {
+                if (buffer.remaining() < 4) {
+                    break outer;
+                }
+                buffer.putInt(value);
+            }
+        }
+        return buffer.array();
+    }
+
+    private static void fail(int payloadBytes, String error) {
+        System.out.println("{\"payload_bytes\":" + payloadBytes
+                + ",\"error\":\"" + error.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", " ") + "\"}");
+    }
+}
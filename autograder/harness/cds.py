@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Application class-data sharing (AppCDS) archives for harness JVMs.
+
+JDK 11 only archives application classes loaded from jar files, so the
+compiled build output is packed into a jar first. A short training run of
+master and workers records the loaded classes, and the archive is dumped
+from that list. Everything is keyed by a fingerprint of the build output
+and the JDK, so it is rebuilt only when either changes.
+"""
+
+import hashlib
+import os
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+from java_driver import find_java_tool
+from input_hash import hash_inputs
+from stats import median
+from watchdog import run_in_group
+
+DEFAULT_ARCHIVE_DIR = os.path.join("build", "autograder", "cds")
+
+# Build output that ends up in the jar (and therefore in the archive)
+BUILD_DIRS = [
+    os.path.join("build", "classes", "java", "main"),
+    os.path.join("build", "resources", "main"),
+]
+BUILD_INPUTS = [
+    "build/classes/java/main/**/*.class",
+    "build/resources/main/**/*",
+]
+
+
+class CdsArchive:
+    def __init__(self, root=".", archive_dir=DEFAULT_ARCHIVE_DIR, master_port=None, timeout=120):
+        self.root = Path(root)
+        self.archive_dir = Path(archive_dir)
+        self.master_port = master_port
+        self.timeout = timeout
+        self.java = find_java_tool("java") or "java"
+        self.key = None
+
+    def java_version(self):
+        try:
+            proc = run_in_group([self.java, "-version"], 30)
+            return proc.stderr.strip()
+        except Exception:
+            return "<unknown>"
+
+    def fingerprint(self):
+        """Archives are only valid for the exact classes and JDK they were dumped from"""
+        if self.key is None:
+            digest = hashlib.sha256()
+            digest.update(hash_inputs(self.root, BUILD_INPUTS).encode("utf-8"))
+            digest.update(self.java_version().encode("utf-8"))
+            self.key = digest.hexdigest()[:16]
+        return self.key
+
+    @property
+    def jar_path(self):
+        return self.archive_dir / f"pdc-{self.fingerprint()}.jar"
+
+    @property
+    def archive_path(self):
+        return self.archive_dir / f"pdc-{self.fingerprint()}.jsa"
+
+    def runtime_options(self):
+        # auto: fall back to normal class loading if the archive is rejected
+        return ["-Xshare:auto", f"-XX:SharedArchiveFile={self.archive_path}"]
+
+    def build_jar(self):
+        """Pack the compiled classes and resources into a jar"""
+        tmp = self.jar_path.with_suffix(".jar.tmp")
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as jar:
+            jar.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\r\n\r\n")
+            for build_dir in BUILD_DIRS:
+                base = self.root / build_dir
+                for path in sorted(base.rglob("*")):
+                    if path.is_file():
+                        jar.write(path, path.relative_to(base).as_posix())
+        os.replace(tmp, self.jar_path)
+
+    def train(self, work_dir):
+        """Run master and workers briefly, returning the merged loaded-class list"""
+        from integration_test import IntegrationTestHarness
+
+        harness = IntegrationTestHarness(
+            str(self.jar_path),
+            master_port=self.master_port,
+            jvm_options=["-Xshare:off", f"-XX:DumpLoadedClassList={work_dir / '{name}.classlist'}"],
+        )
+        try:
+            if not harness.start_master() or not harness.start_workers() or not harness.connect_to_master():
+                raise RuntimeError("; ".join(harness.errors) or "training cluster failed to start")
+            harness.start_response_listener()
+            task_ids = [f"cds-train-{i}" for i in range(8)]
+            for task_id in task_ids:
+                harness.send_task(task_id, "MATRIX_MULTIPLY", "1,2\\3,4|5,6\\7,8", verbose=False)
+            harness.wait_for(task_ids, 10.0)
+        finally:
+            harness.cleanup()
+
+        classes = {}
+        for path in sorted(work_dir.glob("*.classlist")):
+            for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+                if line.strip() and not line.startswith("#"):
+                    classes.setdefault(line.strip(), None)
+        return list(classes)
+
+    def ensure(self):
+        """Build the jar, class list and archive unless they already exist"""
+        if self.archive_path.exists() and self.jar_path.exists():
+            return True, f"CDS archive up to date ({self.archive_path})"
+
+        if not any((self.root / d).is_dir() for d in BUILD_DIRS):
+            return False, f"Compiled classes not found in {BUILD_DIRS[0]}"
+
+        work_dir = self.archive_dir / f"train-{self.fingerprint()}"
+        work_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.build_jar()
+            classes = self.train(work_dir)
+        except Exception as e:
+            return False, f"CDS training failed: {e}"
+        if not classes:
+            return False, "CDS training recorded no loaded classes"
+
+        class_list = self.archive_dir / f"pdc-{self.fingerprint()}.classlist"
+        class_list.write_text("\n".join(classes) + "\n", encoding="utf-8")
+
+        cmd = [self.java, "-Xshare:dump", f"-XX:SharedClassListFile={class_list}",
+               f"-XX:SharedArchiveFile={self.archive_path}", "-cp", str(self.jar_path)]
+        try:
+            proc = run_in_group(cmd, self.timeout)
+        except Exception as e:
+            return False, f"CDS dump error: {e}"
+        if proc.returncode != 0 or not self.archive_path.exists():
+            return False, f"CDS dump failed: {(proc.stderr or proc.stdout).strip()[:200]}"
+
+        return True, f"CDS archive built from {len(classes)} classes ({self.archive_path})"
+
+    def compare_startup(self, harness, runs=5):
+        """Master time-to-listen (ms) with the harness defaults and with the archive"""
+        classpath, options = harness.classpath, list(harness.jvm_options)
+        default, shared = [], []
+
+        try:
+            # Alternate so drift in machine load affects both equally
+            for _ in range(runs):
+                harness.classpath, harness.jvm_options = classpath, options
+                default.append(harness.measure_master_startup())
+                harness.classpath, harness.jvm_options = str(self.jar_path), options + self.runtime_options()
+                shared.append(harness.measure_master_startup())
+                time.sleep(0.2)
+        finally:
+            harness.classpath, harness.jvm_options = classpath, options
+
+        default = [v for v in default if v is not None]
+        shared = [v for v in shared if v is not None]
+        report = {"runs": runs}
+        if default:
+            report["master_startup_ms"] = round(median(default), 3)
+        if shared:
+            report["master_startup_cds_ms"] = round(median(shared), 3)
+        if default and shared:
+            report["startup_saving_pct"] = round(
+                (report["master_startup_ms"] - report["master_startup_cds_ms"]) * 100.0 / report["master_startup_ms"], 2)
+        return report
+
+
+if __name__ == "__main__":
+    archive = CdsArchive()
+    ok, msg = archive.ensure()
+    print(msg)
+    sys.exit(0 if ok else 1)
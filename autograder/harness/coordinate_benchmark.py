@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Scaling profile of Master.coordinate() without any socket overhead.
+Compiles CoordinateBenchmark.java against build/classes and reports wall
+time, speedup over a single-threaded reference multiply, and correctness.
+"""
+
+import sys
+
+from java_driver import (
+    DEFAULT_CLASSES_DIR,
+    DEFAULT_DRIVER_DIR,
+    compile_driver,
+    driver_classpath,
+    parse_json_lines,
+    run_driver,
+)
+
+DEFAULT_SIZES = [64, 128, 256, 512]
+DEFAULT_WORKER_COUNTS = [1, 2, 4, 8]
+
+
+class CoordinateBenchmark:
+    def __init__(self, classes_dir=DEFAULT_CLASSES_DIR, driver_dir=DEFAULT_DRIVER_DIR,
+                 operation="BLOCK_MULTIPLY", sizes=None, worker_counts=None,
+                 repetitions=5, heap="1g", timeout=600):
+        self.classes_dir = classes_dir
+        self.driver_dir = driver_dir
+        self.operation = operation
+        self.sizes = sizes or DEFAULT_SIZES
+        self.worker_counts = worker_counts or DEFAULT_WORKER_COUNTS
+        self.repetitions = repetitions
+        self.heap = heap
+        self.timeout = timeout
+        self.errors = []
+
+    def run_driver(self):
+        """Run every (size, workers) case in one JVM and return its records"""
+        proc = run_driver(
+            "pdc.CoordinateBenchmark",
+            args=[
+                self.operation,
+                ",".join(str(n) for n in self.sizes),
+                ",".join(str(w) for w in self.worker_counts),
+                self.repetitions,
+            ],
+            jvm_options=[f"-Xmx{self.heap}"],
+            classpath=driver_classpath(self.classes_dir, self.driver_dir),
+            timeout=self.timeout,
+        )
+        records = parse_json_lines(proc.stdout)
+        if not records:
+            raise RuntimeError(f"no output from driver (exit {proc.returncode}): {proc.stderr.strip()[:200]}")
+        return records
+
+    def summarize(self, records):
+        """Turn driver records into per-case metrics including scaling vs one worker"""
+        scenarios = {}
+        single_worker = {}
+
+        for record in records:
+            if "coordinate_nanos" in record and record["workers"] == 1:
+                single_worker[record["size"]] = record["coordinate_nanos"]
+
+        for record in records:
+            name = f"n{record['size']}_w{record['workers']}"
+            if "error" in record:
+                self.errors.append(f"{name}: {record['error']}")
+                continue
+
+            coordinate_ms = record["coordinate_nanos"] / 1e6
+            reference_ms = record["reference_nanos"] / 1e6
+            metrics = {
+                "size": record["size"],
+                "workers": record["workers"],
+                "coordinate_ms": round(coordinate_ms, 3),
+                "reference_ms": round(reference_ms, 3),
+                "speedup_vs_reference": round(reference_ms / coordinate_ms, 3) if coordinate_ms else None,
+                "correct": record["correct"],
+            }
+            base = single_worker.get(record["size"])
+            if base and record["coordinate_nanos"]:
+                metrics["speedup_vs_one_worker"] = round(base / record["coordinate_nanos"], 3)
+            if "note" in record:
+                metrics["note"] = record["note"]
+
+            scenarios[name] = metrics
+        return scenarios
+
+    def run_all(self):
+        """Compile the driver and profile coordinate() across sizes and worker counts"""
+        results = {"scenarios": {}, "errors": self.errors}
+
+        ok, msg = compile_driver(["CoordinateBenchmark.java"], self.classes_dir, self.driver_dir)
+        if not ok:
+            self.errors.append(msg)
+            return results
+
+        try:
+            results["scenarios"] = self.summarize(self.run_driver())
+        except Exception as e:
+            self.errors.append(str(e))
+            return results
+
+        for name, metrics in results["scenarios"].items():
+            status = "OK" if metrics["correct"] else "WRONG"
+            print(f"[BENCH] coordinate {name}: {metrics['coordinate_ms']} ms, "
+                  f"speedup {metrics['speedup_vs_reference']}x [{status}]")
+
+        return results
+
+
+if __name__ == "__main__":
+    import json
+
+    benchmark = CoordinateBenchmark()
+    results = benchmark.run_all()
+    json.dump(results, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Parser for JDK 11 unified GC logs (-Xlog:gc).
+Derives allocation volume and pause totals from heap transitions.
+"""
+
+import re
+
+UNIT_BYTES = {"B": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+# e.g. [0.123s][info][gc] GC(3) Pause Young (Normal) (G1 Evacuation Pause) 24M->2M(256M) 3.456ms
+GC_EVENT_RE = re.compile(
+    r"GC\((?P<id>\d+)\)\s+(?P<name>.*?)\s+"
+    r"(?P<before>\d+)(?P<bu>[BKMG])->(?P<after>\d+)(?P<au>[BKMG])\((?P<total>\d+)(?P<tu>[BKMG])\)"
+    r"(?:\s+(?P<ms>[\d.]+)ms)?"
+)
+
+
+def parse_gc_events(text):
+    """Return GC events with heap sizes in bytes and pause time in ms"""
+    events = []
+    for line in text.splitlines():
+        m = GC_EVENT_RE.search(line)
+        if not m:
+            continue
+        events.append({
+            "id": int(m.group("id")),
+            "name": m.group("name"),
+            "before": int(m.group("before")) * UNIT_BYTES[m.group("bu")],
+            "after": int(m.group("after")) * UNIT_BYTES[m.group("au")],
+            "pause_ms": float(m.group("ms")) if m.group("ms") else 0.0,
+            "explicit": "System.gc()" in m.group("name"),
+        })
+    return events
+
+
+def allocation_by_segment(events):
+    """
+    Split events at explicit System.gc() collections and return the bytes
+    allocated in each segment (the heap growth between consecutive GCs).
+    """
+    segments = []
+    current = 0
+    prev_after = 0
+
+    for event in events:
+        current += max(0, event["before"] - prev_after)
+        prev_after = event["after"]
+        if event["explicit"]:
+            segments.append(current)
+            current = 0
+
+    if current:
+        segments.append(current)
+    return segments
+
+
+def pause_summary(events):
+    """Total, max and count of GC pauses (explicit collections excluded)"""
+    pauses = [e["pause_ms"] for e in events if e["pause_ms"] and not e["explicit"]]
+    return {
+        "gc_count": len(pauses),
+        "gc_pause_total_ms": round(sum(pauses), 3),
+        "gc_pause_max_ms": round(max(pauses), 3) if pauses else 0.0,
+    }
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Content hashes of files selected by glob patterns, shared by the suite
+result cache and the AppCDS archive fingerprint.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_inputs(root, patterns):
+    """Hash every file matched by patterns under root, including their paths"""
+    digest = hashlib.sha256()
+    root = Path(root)
+
+    for pattern in patterns:
+        matches = sorted(p for p in root.glob(pattern) if p.is_file())
+        if not matches:
+            # Absence is an input too (e.g. the compilation check)
+            digest.update(f"{pattern}:<missing>\n".encode("utf-8"))
+            continue
+
+        for path in matches:
+            rel = path.relative_to(root).as_posix()
+            digest.update(f"{rel}:{hash_file(path)}\n".encode("utf-8"))
+
+    return digest.hexdigest()
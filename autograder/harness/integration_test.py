@@ -4,7 +4,9 @@ Integration test harness for CSM218 distributed system evaluation
 Spawns real JVM processes, communicates via sockets
 """
 
+import errno
 import json
+import shutil
 import subprocess
 import socket
 import time
@@ -12,38 +14,341 @@ import os
 import signal
 import sys
 import threading
+import selectors
+import random
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from stats import bootstrap_ci, jain_index, linear_fit, median, percentile
+from workload import NpyMatrix, WorkloadMix, matrix_elements, task_payload, write_random_npy
+from jfr_summary import JfrSummarizer, jfr_options
+from cds import CdsArchive
+from traffic_trace import TraceRecorder
+from wire_proxy import WireCounter, WireProxy
+from watchdog import Watchdog
+
+# Message types the master may use to answer an RPC_REQUEST
+RESPONSE_TYPES = ("TASK_COMPLETE", "RPC_RESPONSE", "TASK_ERROR")
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.json'
+
+# Generated .npy operands are kept here between runs
+WORKLOAD_DIR = os.path.join("build", "autograder", "workloads")
+
+DEFAULT_MASTER_PORT = 9999
+
+
+def base_port():
+    """First port this harness may use; CSM218_PORT_BASE keeps concurrent graders apart"""
+    return int(os.environ.get('CSM218_PORT_BASE', DEFAULT_MASTER_PORT))
+
+
+def load_performance_baseline(config_path=CONFIG_PATH):
+    """The performance_baseline bounds (milliseconds) from config.json"""
+    with open(config_path, 'r') as f:
+        return json.load(f)['autograder_config']['performance_baseline']
+
+# connect_ex() results meaning a non-blocking connect is under way
+CONNECT_PENDING = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno, 'WSAEWOULDBLOCK', 0))
+
+# Without worker-tagged responses, a rejoined worker counts as working once its
+# CPU time, less an idle JVM's, grows by at least this share of the median of
+# the other workers over the same window
+CHURN_WORK_SHARE = 0.25
+# Below this much CPU per worker (s) the other workers were idle too; no verdict
+CHURN_MIN_CPU_S = 0.05
+
+# Protocol violations injected by the malformed-frame flood
+MALFORMED_KINDS = ("bad_magic", "bad_version", "truncated_json", "oversized_field")
+
 class IntegrationTestHarness:
-    def __init__(self, classpath, master_port=9999, num_workers=3):
+    def __init__(self, classpath, master_port=None, num_workers=3, multi_node=False, jfr_dir=None,
+                 jvm_options=None, gc_log_dir=None, trace_path=None, scenario_budget=None, run_budget=None):
         self.classpath = classpath
-        self.master_port = master_port
+        self.master_port = master_port or base_port()
         self.num_workers = num_workers
+        self.multi_node = multi_node
+        self.jfr_dir = jfr_dir
+        self.jvm_options = list(jvm_options or [])
+        self.gc_log_dir = gc_log_dir
+        self.gc_logs = []
+        self.trace = TraceRecorder(trace_path) if trace_path else None
+        self.wire = None
+        # Workers connect here instead of the master port when a proxy is in between
+        self.worker_master_port = None
+        self.scenario = 'scenario'
+        self.recordings = []
+        self.master_host = 'localhost'
+        self.nodes = {}
+        # Whether 127.0.0.x aliases can be bound; otherwise every node uses 127.0.0.1
+        self.loopback_aliases = False
         self.master_process = None
         self.worker_processes = []
         self.master_socket = None
         self.results = {}
         self.start_times = {}
         self.end_times = {}
+        # Task id -> worker that ran it, for responses whose sender names one
+        self.task_workers = {}
+        self.process_logs = {}
+        self.unparsed_responses = 0
         self.errors = []
+        self.watchdog = Watchdog(self.kill_process_groups, run_budget, scenario_budget)
+    
+    def reset_run_state(self):
+        """Forget timings and processes from a previous scenario"""
+        self.worker_processes = []
+        self.start_times = {}
+        self.end_times = {}
+        # Task id -> worker that ran it, for responses whose sender names one
+        self.task_workers = {}
+        self.process_logs = {}
+        self.unparsed_responses = 0
+        self.recordings = []
+        self.gc_logs = []
+    
+    def drain_output(self, name, proc):
+        """Consume a process' stdout/stderr so long runs never block on a full pipe"""
+        log = deque(maxlen=200)
+        self.process_logs[name] = log
+        
+        def pump(stream):
+            try:
+                for line in stream:
+                    log.append(line.rstrip())
+            except Exception:
+                pass
+        
+        for stream in (proc.stdout, proc.stderr):
+            if stream is not None:
+                threading.Thread(target=pump, args=(stream,), daemon=True).start()
+    
+    def sample_rss(self, proc):
+        """Resident set size of a process (or pid) in bytes (Linux /proc), or None"""
+        try:
+            with open(f"/proc/{getattr(proc, 'pid', proc)}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def sample_cpu(self, proc):
+        """CPU time (user + system) a process has used, in seconds (Linux /proc), or None"""
+        try:
+            with open(f"/proc/{getattr(proc, 'pid', proc)}/stat", "r") as f:
+                # The command name may contain spaces; fields are counted after it
+                fields = f.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, ValueError, IndexError):
+            return None
+    
+    def worker_cpu_times(self):
+        """CPU seconds used so far by each live worker"""
+        times = {}
+        for worker_id, proc in self.worker_processes:
+            if proc.poll() is None:
+                cpu = self.sample_cpu(proc)
+                if cpu is not None:
+                    times[worker_id] = cpu
+        return times
+    
+    def plan_nodes(self):
+        """
+        In multi-node mode, give the master and each worker its own loopback
+        address (127.0.0.x) and a disjoint set of CPUs, so that per-node
+        capacity is bounded like on a real cluster.
+        """
+        self.nodes = {}
+        self.master_host = 'localhost'
+        if not self.multi_node:
+            return
+        
+        names = ['master'] + [f'worker-{i}' for i in range(self.num_workers)]
+        addresses = [f'127.0.0.{i + 2}' for i in range(len(names))]
+        self.loopback_aliases = all(self.address_usable(a) for a in addresses)
+        if not self.loopback_aliases:
+            self.errors.append("Loopback aliases unavailable; multi-node mode uses localhost only")
+            addresses = ['127.0.0.1'] * len(names)
+        
+        cpu_sets = [None] * len(names)
+        if hasattr(os, 'sched_getaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+            per_node = max(1, len(cpus) // len(names))
+            if len(cpus) < len(names):
+                self.errors.append(f"Only {len(cpus)} CPUs for {len(names)} nodes; CPU sets overlap")
+            cpu_sets = [
+                set(cpus[(i * per_node + k) % len(cpus)] for k in range(per_node))
+                for i in range(len(names))
+            ]
+        else:
+            self.errors.append("CPU affinity unsupported on this platform; nodes share all CPUs")
+        
+        for name, address, cpu_set in zip(names, addresses, cpu_sets):
+            self.nodes[name] = {'address': address, 'cpus': cpu_set}
+        self.master_host = self.nodes['master']['address']
+        
+        self.results['placement'] = {
+            name: {'address': node['address'], 'cpus': sorted(node['cpus']) if node['cpus'] else None}
+            for name, node in self.nodes.items()
+        }
+        for name, node in self.nodes.items():
+            print(f"[TEST] Node {name}: {node['address']} cpus={sorted(node['cpus']) if node['cpus'] else 'all'}")
+    
+    def address_usable(self, address):
+        """Whether this host can bind the given loopback address"""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                probe.bind((address, 0))
+            return True
+        except OSError:
+            return False
+    
+    def node_for(self, name):
+        """Placement for a process, creating one for workers beyond the initial plan"""
+        if not self.multi_node:
+            return None
+        if name not in self.nodes:
+            # Extra workers (e.g. churn replacements) share CPUs round-robin
+            planned = list(self.nodes.values())
+            base = planned[len(self.nodes) % len(planned)]
+            address = f'127.0.0.{len(self.nodes) + 2}'
+            if not (self.loopback_aliases and self.address_usable(address)):
+                address = '127.0.0.1'
+            self.nodes[name] = {'address': address, 'cpus': base['cpus']}
+        return self.nodes[name]
+    
+    def launch_jvm(self, name, main_class, env):
+        """Start a master/worker JVM, applying node placement when enabled"""
+        cmd = ['java']
+        cpus = None
+        
+        node = self.node_for(name)
+        if node and node['cpus']:
+            cpus = node['cpus']
+            cmd.append(f'-XX:ActiveProcessorCount={len(cpus)}')
+            # taskset pins the JVM before its first thread exists
+            if shutil.which('taskset'):
+                cmd = ['taskset', '-c', ','.join(str(c) for c in sorted(cpus))] + cmd
+        
+        # '{name}' lets per-process options (e.g. class lists) name their files
+        cmd += [option.replace('{name}', name) for option in self.jvm_options]
+        if self.gc_log_dir:
+            os.makedirs(self.gc_log_dir, exist_ok=True)
+            gc_log = Path(self.gc_log_dir) / f"{name}-{len(self.gc_logs)}.log"
+            if gc_log.exists():
+                gc_log.unlink()
+            cmd.append(f'-Xlog:gc:file={gc_log}')
+            self.gc_logs.append((name, gc_log))
+        
+        if self.jfr_dir:
+            # Restarted processes get their own recording
+            scenario_dir = Path(self.jfr_dir) / self.scenario.lower().replace(' ', '_')
+            scenario_dir.mkdir(parents=True, exist_ok=True)
+            recording = scenario_dir / f"{name}-{len(self.recordings)}.jfr"
+            cmd += jfr_options(recording)
+            self.recordings.append((name, recording))
+        
+        cmd += ['-cp', self.classpath, main_class]
+        proc = subprocess.Popen(
+            cmd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            # Own process group, so the JVM and anything it forks can be killed together
+            start_new_session=True
+        )
+        if cpus and cmd[0] != 'taskset':
+            try:
+                os.sched_setaffinity(proc.pid, cpus)
+            except OSError as e:
+                self.errors.append(f"Could not pin {name} to CPUs {sorted(cpus)}: {e}")
+        self.drain_output(name, proc)
+        return proc
+    
+    def signal_group(self, proc, sig):
+        """Signal a JVM's whole process group; False if the group is gone"""
+        try:
+            os.killpg(proc.pid, sig)
+            return True
+        except (ProcessLookupError, PermissionError):
+            return False
+    
+    def stop_process(self, name, proc, grace=2):
+        """
+        SIGTERM a JVM's process group and SIGKILL it if it is still running
+        after `grace` seconds. Returns False if it had to be killed.
+        """
+        graceful = True
+        if proc.poll() is None:
+            self.signal_group(proc, signal.SIGTERM)
+            try:
+                proc.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                graceful = False
+                self.errors.append(f"{name} ignored SIGTERM for {grace}s; killed its process group")
+        # Also reaps children that outlived the JVM
+        self.signal_group(proc, signal.SIGKILL)
+        proc.wait()
+        return graceful
+    
+    def kill_process_groups(self):
+        """Watchdog action: SIGKILL every spawned process group and drop connections"""
+        procs = [self.master_process] + [p for _, p in self.worker_processes]
+        killed = 0
+        for proc in procs:
+            if proc is None:
+                continue
+            alive = proc.poll() is None
+            if self.signal_group(proc, signal.SIGKILL) and alive:
+                killed += 1
+        if self.master_socket:
+            try:
+                # Unblocks scenario threads waiting on the dead master
+                self.master_socket.close()
+            except OSError:
+                pass
+        return killed
+    
+    def master_env(self):
+        env = os.environ.copy()
+        env['MASTER_PORT'] = str(self.master_port)
+        env['STUDENT_ID'] = 'integration-test'
+        if self.multi_node:
+            # Submissions that honour MASTER_HOST bind only the master's node address
+            env['MASTER_HOST'] = self.master_host
+        return env
+    
+    def measure_master_startup(self, timeout=30.0):
+        """Milliseconds from launching the master JVM until its port accepts connections"""
+        self.reset_run_state()
+        self.plan_nodes()
+        begin = time.time()
+        proc = self.launch_jvm('master', 'pdc.ReferenceMaster', self.master_env())
+        elapsed = None
+        try:
+            while time.time() - begin < timeout and proc.poll() is None:
+                try:
+                    socket.create_connection((self.master_host, self.master_port), timeout=0.5).close()
+                    elapsed = (time.time() - begin) * 1000
+                    break
+                except OSError:
+                    time.sleep(0.005)
+        finally:
+            self.stop_process('master', proc, grace=5)
+        return elapsed
     
     def start_master(self):
         """Launch master process"""
         try:
-            env = os.environ.copy()
-            env['MASTER_PORT'] = str(self.master_port)
-            env['STUDENT_ID'] = 'integration-test'
-            
-            self.master_process = subprocess.Popen(
-                ['java', '-cp', self.classpath, 'pdc.ReferenceMaster'],
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            print(f"[TEST] Master started on port {self.master_port}")
+            self.reset_run_state()
+            self.plan_nodes()
+            self.master_process = self.launch_jvm('master', 'pdc.ReferenceMaster', self.master_env())
+            
+            print(f"[TEST] Master started on {self.master_host}:{self.master_port}")
             time.sleep(1)
             
             return True
@@ -51,27 +356,30 @@ class IntegrationTestHarness:
             self.errors.append(f"Failed to start master: {e}")
             return False
     
+    def start_worker(self, worker_id):
+        """Launch (or relaunch) a single worker process"""
+        env = os.environ.copy()
+        env['WORKER_ID'] = worker_id
+        env['MASTER_HOST'] = self.master_host
+        env['MASTER_PORT'] = str(self.worker_master_port or self.master_port)
+        env['STUDENT_ID'] = 'integration-test'
+        node = self.node_for(worker_id)
+        if node:
+            env['WORKER_HOST'] = node['address']
+        
+        proc = self.launch_jvm(worker_id, 'pdc.ReferenceWorker', env)
+        
+        # A restarted worker replaces its dead predecessor
+        self.worker_processes = [(w, p) for w, p in self.worker_processes if w != worker_id]
+        self.worker_processes.append((worker_id, proc))
+        print(f"[TEST] {worker_id} started")
+        return proc
+    
     def start_workers(self):
         """Launch worker processes"""
         try:
             for i in range(self.num_workers):
-                worker_id = f'worker-{i}'
-                env = os.environ.copy()
-                env['WORKER_ID'] = worker_id
-                env['MASTER_HOST'] = 'localhost'
-                env['MASTER_PORT'] = str(self.master_port)
-                env['STUDENT_ID'] = 'integration-test'
-                
-                proc = subprocess.Popen(
-                    ['java', '-cp', self.classpath, 'pdc.ReferenceWorker'],
-                    env=env,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                
-                self.worker_processes.append((worker_id, proc))
-                print(f"[TEST] {worker_id} started")
+                self.start_worker(f'worker-{i}')
             
             time.sleep(2)
             return True
@@ -83,36 +391,131 @@ class IntegrationTestHarness:
         """Connect to master server"""
         try:
             self.master_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.master_socket.connect(('localhost', self.master_port))
+            self.master_socket.connect((self.master_host, self.master_port))
             print("[TEST] Connected to master")
             return True
         except Exception as e:
             self.errors.append(f"Failed to connect to master: {e}")
             return False
     
-    def send_task(self, task_id, task_type, payload):
-        """Send RPC task to master"""
+    def open_connection(self):
+        """An additional client connection to the master"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect((self.master_host, self.master_port))
+        return sock
+    
+    def build_message(self, task_id, task_type, payload, student_id="integration-test"):
+        """Encode an RPC_REQUEST frame (newline-delimited JSON)"""
+        message = {
+            "magic": "CSM218",
+            "version": 1,
+            "messageType": "RPC_REQUEST",
+            "studentId": student_id,
+            "timestamp": int(time.time() * 1000),
+            "payload": f"{task_id};{task_type};{payload}"
+        }
+        return (json.dumps(message) + '\n').encode('utf-8')
+    
+    def send_task(self, task_id, task_type, payload, verbose=True, sock=None, student_id="integration-test"):
+        """Send RPC task to master (on the main connection unless `sock` is given)"""
         try:
-            message = {
-                "magic": "CSM218",
-                "version": 1,
-                "messageType": "RPC_REQUEST",
-                "studentId": "integration-test",
-                "timestamp": int(time.time() * 1000),
-                "payload": f"{task_id};{task_type};{payload}"
-            }
-            
-            msg_json = json.dumps(message) + '\n'
-            self.master_socket.sendall(msg_json.encode('utf-8'))
-            
             self.start_times[task_id] = time.time()
-            print(f"[TEST] Sent task {task_id}")
+            self.send_frame(sock or self.master_socket, self.build_message(task_id, task_type, payload, student_id))
+            
+            if verbose:
+                print(f"[TEST] Sent task {task_id}")
             
             return True
         except Exception as e:
             self.errors.append(f"Failed to send task: {e}")
             return False
     
+    def send_streamed_task(self, task_id, task_type, operands, sock=None, student_id="integration-test"):
+        """
+        Send an RPC_REQUEST whose operands are NpyMatrix files, encoding and
+        writing them block by block so the payload is never built in memory.
+        Returns the number of bytes sent.
+        """
+        sock = sock or self.master_socket
+        header = json.dumps({
+            "magic": "CSM218",
+            "version": 1,
+            "messageType": "RPC_REQUEST",
+            "studentId": student_id,
+            "timestamp": int(time.time() * 1000),
+        })
+        # Same frame as build_message(), with the payload string left open
+        prefix = header[:-1] + ', "payload": "' + json.dumps(f"{task_id};{task_type};")[1:-1]
+        
+        self.start_times[task_id] = time.time()
+        prefix = prefix.encode('utf-8')
+        self.send_frame(sock, prefix)
+        sent = len(prefix)
+        for i, matrix in enumerate(operands):
+            if i:
+                self.send_frame(sock, b'|')
+                sent += 1
+            for chunk in matrix.encoded_chunks():
+                # Row separators are backslashes, which JSON escapes
+                chunk = chunk.replace(b'\\', b'\\\\')
+                self.send_frame(sock, chunk)
+                sent += len(chunk)
+        self.send_frame(sock, b'"}\n')
+        return sent + 3
+    
+    def send_frame(self, sock, frame):
+        """Write frame bytes to a master connection, recording them when tracing"""
+        if self.trace:
+            self.trace.record(sock, 'send', frame)
+        if self.wire:
+            self.wire.feed((sock, 'send'), 'client_to_master', frame)
+        sock.sendall(frame)
+    
+    def received(self, sock, line):
+        """Hook for every response line read from the master"""
+        if self.trace:
+            self.trace.record(sock, 'recv', line.rstrip('\n') if isinstance(line, str) else line)
+        if self.wire:
+            line = line.encode('utf-8') if isinstance(line, str) else line
+            self.wire.feed((sock, 'recv'), 'master_to_client', line.rstrip(b'\n') + b'\n')
+    
+    def start_response_listener(self, sock=None):
+        """Read master responses in the background and record completion times"""
+        sock = sock or self.master_socket
+        
+        def listen():
+            try:
+                for line in sock.makefile('r', encoding='utf-8', errors='replace'):
+                    self.received(sock, line)
+                    try:
+                        msg = json.loads(line)
+                    except ValueError:
+                        self.unparsed_responses += 1
+                        continue
+                    
+                    if msg.get("messageType") in RESPONSE_TYPES:
+                        task_id = str(msg.get("payload", "")).split(';', 1)[0]
+                        self.end_times.setdefault(task_id, time.time())
+                        sender = msg.get("sender") or msg.get("workerId")
+                        if sender:
+                            self.task_workers.setdefault(task_id, str(sender))
+            except Exception:
+                # Socket closed during cleanup
+                pass
+        
+        listener = threading.Thread(target=listen, daemon=True)
+        listener.start()
+        return listener
+    
+    def latencies(self, task_ids=None):
+        """Completed-task latencies in seconds, keyed by task id"""
+        ids = task_ids if task_ids is not None else self.start_times.keys()
+        return {
+            task_id: self.end_times[task_id] - self.start_times[task_id]
+            for task_id in ids
+            if task_id in self.end_times and task_id in self.start_times
+        }
+    
     def send_parallel_tasks(self, num_tasks=4):
         """Send multiple tasks in parallel"""
         try:
@@ -155,13 +558,125 @@ class IntegrationTestHarness:
         except Exception as e:
             return False, str(e)
     
+    def wait_for(self, task_ids, timeout):
+        """Wait until every task has a response; True if all completed in time"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(t in self.end_times for t in task_ids):
+                return True
+            # The watchdog has killed the cluster; nothing more will arrive
+            if self.watchdog.expired():
+                return False
+            time.sleep(0.01)
+        return False
+    
+    def measure_timings(self, run_index, timeout=10.0):
+        """
+        One timing run against a running cluster: the latency of a single
+        task, then the makespan of four tasks submitted together.
+        """
+        payload = '1,2\\3,4|5,6\\7,8'
+        sample = {'single_task_ms': None, 'four_tasks_ms': None, 'start_spread_s': None}
+        
+        single = f'timing-{run_index}-single'
+        self.send_task(single, 'MATRIX_MULTIPLY', payload, verbose=False)
+        if self.wait_for([single], timeout):
+            sample['single_task_ms'] = (self.end_times[single] - self.start_times[single]) * 1000
+        if self.watchdog.expired():
+            return sample
+        
+        batch = [f'timing-{run_index}-par-{i}' for i in range(4)]
+        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+            for task_id in batch:
+                executor.submit(self.send_task, task_id, 'MATRIX_MULTIPLY', payload, False)
+        starts = [self.start_times[t] for t in batch if t in self.start_times]
+        if starts:
+            sample['start_spread_s'] = max(starts) - min(starts)
+        if self.wait_for(batch, timeout):
+            sample['four_tasks_ms'] = (max(self.end_times[t] for t in batch) - min(starts)) * 1000
+        
+        return sample
+    
+    def run_repeated_timings(self, runs=5, warmup=1, timeout=10.0):
+        """Repeat measure_timings, discarding the first `warmup` runs"""
+        samples = []
+        for i in range(warmup + runs):
+            if self.watchdog.expired():
+                break
+            sample = self.measure_timings(i, timeout)
+            if i >= warmup:
+                samples.append(sample)
+        return samples
+    
+    def summarize_timings(self, samples, confidence=0.95):
+        """Median and bootstrap confidence interval per timing metric"""
+        summary = {}
+        for metric in ('single_task_ms', 'four_tasks_ms', 'start_spread_s'):
+            values = [x[metric] for x in samples if x[metric] is not None]
+            if not values:
+                continue
+            low, high = bootstrap_ci(values, confidence=confidence)
+            summary[metric] = {'median': median(values), 'ci_low': low, 'ci_high': high, 'n': len(values)}
+        
+        # Speedup of four concurrent tasks over four sequential single tasks
+        speedups = [
+            4 * x['single_task_ms'] / x['four_tasks_ms']
+            for x in samples if x['single_task_ms'] and x['four_tasks_ms']
+        ]
+        if speedups:
+            low, high = bootstrap_ci(speedups, confidence=confidence)
+            summary['speedup'] = {'median': median(speedups), 'ci_low': low, 'ci_high': high, 'n': len(speedups)}
+        return summary
+    
+    def baseline_scale(self, summary, baseline):
+        """
+        Factor applied to the performance_baseline bounds. They assume a single
+        task within single_task_min_ms..single_task_max_ms; when the measured
+        median lies outside that range (and scale_to_single_task is set in
+        config.json) every bound is scaled by median / midpoint, so the bounds
+        keep separating parallel from sequential makespans on faster or slower
+        hardware. 1.0 means the configured values are enforced as written.
+        """
+        single = summary.get('single_task_ms')
+        if not baseline.get('scale_to_single_task', True) or not single:
+            return 1.0
+        if baseline['single_task_min_ms'] <= single['median'] <= baseline['single_task_max_ms']:
+            return 1.0
+        return single['median'] / ((baseline['single_task_min_ms'] + baseline['single_task_max_ms']) / 2)
+    
+    def grade_parallelism(self, summary, baseline, tolerance=0.0):
+        """
+        Verdict from the four-task makespan interval against performance_baseline
+        (scaled by baseline_scale): True when the whole interval lies within the
+        parallel bound, False when it lies within the sequential range, None
+        (not graded) when the interval straddles the bounds.
+        """
+        four = summary.get('four_tasks_ms')
+        if not four:
+            return False, "No four-task timing completed"
+        
+        scale = self.baseline_scale(summary, baseline)
+        
+        parallel_max = baseline['four_tasks_parallel_max_ms'] * scale * (1 + tolerance)
+        sequential_min = baseline['four_tasks_sequential_min_ms'] * scale * (1 - tolerance)
+        interval = f"median {four['median']:.0f} ms, CI [{four['ci_low']:.0f}, {four['ci_high']:.0f}] ms, n={four['n']}"
+        if scale != 1.0:
+            interval += f", bounds scaled x{scale:.2f} to the single-task median"
+        
+        if four['ci_high'] <= parallel_max:
+            return True, f"Parallel execution confirmed ({interval} <= {parallel_max:.0f} ms)"
+        if four['ci_low'] >= sequential_min:
+            return False, f"Sequential execution confirmed ({interval} >= {sequential_min:.0f} ms)"
+        if four['ci_low'] > parallel_max:
+            return False, f"Too slow for parallel execution ({interval} > {parallel_max:.0f} ms)"
+        return None, f"Inconclusive, interval straddles the bounds ({interval})"
+    
     def kill_worker(self, index):
         """Kill a worker process for failure simulation"""
         try:
             if index < len(self.worker_processes):
                 worker_id, proc = self.worker_processes[index]
-                proc.terminate()
-                proc.wait(timeout=2)
+                self.stop_process(worker_id, proc)
                 print(f"[TEST] Killed {worker_id}")
                 return True
         except Exception as e:
@@ -170,24 +685,49 @@ class IntegrationTestHarness:
     
     def cleanup(self):
         """Cleanup all processes"""
-        try:
-            if self.master_socket:
+        # Recordings are written on exit, which takes longer than a plain shutdown
+        grace = 15 if self.jfr_dir else 2
+        if self.master_socket:
+            try:
                 self.master_socket.close()
+            except OSError:
+                pass
+        
+        # Every process is stopped even if an earlier one fails to
+        procs = [('master', self.master_process)] if self.master_process else []
+        for name, proc in procs + list(self.worker_processes):
+            try:
+                self.stop_process(name, proc, grace)
+            except Exception as e:
+                self.errors.append(f"Cleanup error ({name}): {e}")
+        
+        print("[TEST] Cleanup complete")
+        
+        if self.jfr_dir:
+            self.collect_profiles()
+    
+    def collect_profiles(self):
+        """Summarize this scenario's flight recordings into results['profiles']"""
+        summarizer = JfrSummarizer()
+        profiles = self.results.setdefault('profiles', {}).setdefault(self.scenario, {})
+        
+        for name, recording in self.recordings:
+            if not recording.exists():
+                # Killed processes (kill_worker, churn) never dump their recording
+                continue
+            key = name if name not in profiles else recording.stem
+            try:
+                profiles[key] = summarizer.summarize_file(str(recording))
+                profiles[key]['recording'] = str(recording)
+            except Exception as e:
+                self.errors.append(f"JFR summary failed for {recording}: {e}")
+                continue
             
-            if self.master_process:
-                self.master_process.terminate()
-                self.master_process.wait(timeout=2)
-            
-            for worker_id, proc in self.worker_processes:
-                try:
-                    proc.terminate()
-                    proc.wait(timeout=2)
-                except:
-                    proc.kill()
-            
-            print("[TEST] Cleanup complete")
-        except Exception as e:
-            self.errors.append(f"Cleanup error: {e}")
+            hot = profiles[key]['hot_pdc_methods'] or profiles[key]['hot_methods']
+            if hot:
+                print(f"[TEST] {key}: hottest {hot[0]['method']} ({hot[0]['pct']}% of samples)")
+        
+        self.recordings = []
     
     def run_basic_test(self):
         """Run basic communication test"""
@@ -215,8 +755,14 @@ class IntegrationTestHarness:
         finally:
             self.cleanup()
     
-    def run_parallelism_test(self):
-        """Run parallelism detection test"""
+    def run_parallelism_test(self, runs=1, warmup=0):
+        """
+        Run parallelism detection test. With runs > 1 (--repeat) the verdict
+        comes from repeated timings and their confidence interval instead of a
+        single start-spread threshold; an inconclusive interval is not graded
+        (None). grade.py reaches the repeated mode through the performance
+        baseline suite, not through this CLI scenario.
+        """
         try:
             if not self.start_master():
                 return False
@@ -227,6 +773,18 @@ class IntegrationTestHarness:
             if not self.connect_to_master():
                 return False
             
+            if runs > 1:
+                self.start_response_listener()
+                samples = self.run_repeated_timings(runs, warmup)
+                summary = self.summarize_timings(samples)
+                parallel, msg = self.grade_parallelism(summary, load_performance_baseline())
+                self.results['parallelism'] = {
+                    f'{metric}_{key}': round(value, 3)
+                    for metric, stats in summary.items() for key, value in stats.items()
+                }
+                print(f"[TEST] Parallelism test: {msg}")
+                return parallel
+            
             if not self.send_parallel_tasks(4):
                 return False
             
@@ -278,41 +836,1288 @@ class IntegrationTestHarness:
             return False
         finally:
             self.cleanup()
+    
+    def run_soak_test(self, duration=1800, rate=5.0, sample_interval=10.0,
+                      rss_growth_limit_mb_per_min=1.0, latency_drift_limit=0.5):
+        """
+        Drive steady traffic for `duration` seconds, sampling per-process RSS
+        and request latency, then fit linear trends to flag leaks and drift.
+        """
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            if not self.connect_to_master():
+                return False
+            
+            self.start_response_listener()
+            processes = [('master', self.master_process)] + list(self.worker_processes)
+            rss_samples = {name: [] for name, _ in processes}
+            latency_samples = []
+            
+            print(f"[TEST] Soak test: {rate:.1f} tasks/s for {duration:.0f}s")
+            payload = '1,2\\3,4|5,6\\7,8'
+            begin = time.time()
+            next_send = begin
+            next_sample = begin + sample_interval
+            sent = 0
+            window_ids = []
+            
+            while time.time() - begin < duration:
+                now = time.time()
+                if now >= next_send:
+                    task_id = f'soak-{sent}'
+                    if not self.send_task(task_id, 'MATRIX_MULTIPLY', payload, verbose=False):
+                        return False
+                    window_ids.append(task_id)
+                    sent += 1
+                    next_send += 1.0 / rate
+                
+                if now >= next_sample:
+                    elapsed = now - begin
+                    for name, proc in processes:
+                        rss = self.sample_rss(proc)
+                        if rss is not None:
+                            rss_samples[name].append((elapsed, rss))
+                    
+                    # Median latency of tasks sent in the previous window that have completed
+                    window = list(self.latencies(window_ids).values())
+                    if window:
+                        latency_samples.append((elapsed, percentile(window, 50)))
+                    window_ids = [t for t in window_ids if t not in self.end_times]
+                    next_sample += sample_interval
+                
+                time.sleep(max(0.0, min(next_send, next_sample) - time.time()))
+            
+            # Give in-flight tasks a moment to finish before judging completion
+            time.sleep(min(5.0, sample_interval))
+            report = self.analyze_soak(rss_samples, latency_samples, sent, duration,
+                                       rss_growth_limit_mb_per_min, latency_drift_limit)
+            self.results['soak'] = report
+            
+            for flag in report['flags']:
+                print(f"[TEST] Soak: {flag}")
+            print(f"[TEST] Soak test: {report['completed']}/{sent} tasks completed, "
+                  f"{len(report['flags'])} issue(s) flagged")
+            
+            return not report['flags']
+        except Exception as e:
+            self.errors.append(f"Soak test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+    
+    def run_churn_test(self, duration=120, churn_interval=10.0, rate=10.0,
+                       bucket=2.0, min_workers=1, recovery_fraction=0.9):
+        """
+        Run a long job while workers continuously leave (SIGKILL) and rejoin
+        every `churn_interval` seconds. Measures the throughput dip while
+        capacity is reduced, the time to recover once it returns, and whether
+        rejoined workers are actually given work.
+        """
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            if not self.connect_to_master():
+                return False
+            
+            self.start_response_listener()
+            
+            # CPU an idle, just-started worker JVM burns (JIT, GC, class
+            # loading), measured over the same phase of its life as a rejoin
+            settle = min(2.0, churn_interval / 4)
+            time.sleep(settle)
+            idle_start, idle_begin = self.worker_cpu_times(), time.time()
+            time.sleep(settle)
+            idle_end = self.worker_cpu_times()
+            idle_rates = [(idle_end[w] - idle_start[w]) / (time.time() - idle_begin)
+                          for w in idle_start if w in idle_end]
+            idle_rate = median(idle_rates) if idle_rates else 0.0
+            
+            print(f"[TEST] Churn test: {rate:.1f} tasks/s for {duration:.0f}s, "
+                  f"membership change every {churn_interval:.0f}s")
+            payload = '1,2\\3,4|5,6\\7,8'
+            begin = time.time()
+            next_send = begin
+            # Let throughput settle before the first departure
+            next_churn = begin + max(churn_interval, 3 * bucket)
+            sent = 0
+            events = []
+            departed = []
+            # Windows opened after each join, closed at the next event
+            work = {}
+            window = None
+            
+            while time.time() - begin < duration:
+                now = time.time()
+                if window and window['start'] is None and now >= window['start_at']:
+                    window['start'], window['started'] = self.worker_cpu_times(), now
+                if now >= next_send:
+                    if not self.send_task(f'churn-{sent}', 'MATRIX_MULTIPLY', payload, verbose=False):
+                        return False
+                    sent += 1
+                    next_send += 1.0 / rate
+                
+                if now >= next_churn:
+                    if window:
+                        work[window['event']] = self.close_work_window(window, idle_rate)
+                        window = None
+                    if departed:
+                        worker_id = departed.pop(0)
+                        self.start_worker(worker_id)
+                        events.append((time.time() - begin, 'join', worker_id))
+                        window = {'event': len(events) - 1, 'worker': worker_id, 'joined': time.time(),
+                                  'start_at': time.time() + settle, 'start': None}
+                    else:
+                        live = sorted(w for w, p in self.worker_processes if p.poll() is None)
+                        if len(live) > min_workers:
+                            leaves = sum(1 for e in events if e[1] == 'leave')
+                            worker_id = live[leaves % len(live)]
+                            proc = dict(self.worker_processes)[worker_id]
+                            self.signal_group(proc, signal.SIGKILL)
+                            proc.wait(timeout=2)
+                            print(f"[TEST] {worker_id} left")
+                            departed.append(worker_id)
+                            events.append((time.time() - begin, 'leave', worker_id))
+                    next_churn += churn_interval
+                
+                wake = min(next_send, next_churn)
+                if window and window['start'] is None:
+                    wake = min(wake, window['start_at'])
+                time.sleep(max(0.0, wake - time.time()))
+            
+            time.sleep(min(5.0, churn_interval))
+            if window:
+                work[window['event']] = self.close_work_window(window, idle_rate)
+            report = self.analyze_churn(begin, events, sent, bucket, recovery_fraction, work)
+            self.results['churn'] = report
+            
+            for join in report['joins']:
+                print(f"[TEST] Churn: {join['worker']} rejoined at {join['t']:.1f}s, "
+                      f"recovery {join['recovery_s']}s, received work: {join['received_work']}")
+            print(f"[TEST] Churn test: {report['completed']}/{sent} tasks completed, "
+                  f"worst dip {report.get('worst_dip_ratio')}")
+            
+            starved = [j['worker'] for j in report['joins'] if j['received_work'] is False]
+            return not starved and report['completed'] >= sent * 0.95
+        except Exception as e:
+            self.errors.append(f"Churn test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+    
+    def close_work_window(self, window, idle_rate):
+        """
+        Whether a rejoined worker was given work. Counts the tasks it returned
+        when responses name their worker; otherwise compares its CPU time
+        growth since it settled, less an idle JVM's, with the other live
+        workers' over the same window. received_work is None when neither
+        signal can tell.
+        """
+        now = time.time()
+        record = {'received_work': None, 'work_tasks': None, 'work_cpu_s': None}
+        
+        tagged = [t for t, end in self.end_times.items() if window['joined'] <= end <= now and t in self.task_workers]
+        if tagged:
+            own_tasks = sum(1 for t in tagged if self.task_workers[t] == window['worker'])
+            record.update(received_work=own_tasks > 0, work_tasks=own_tasks)
+            return record
+        
+        start, end = window['start'], self.worker_cpu_times()
+        if not start:
+            return record
+        idle = idle_rate * (now - window['started'])
+        deltas = {w: max(0.0, end[w] - start[w] - idle) for w in start if w in end}
+        own = deltas.pop(window['worker'], None)
+        if own is None or not deltas:
+            return record
+        record['work_cpu_s'] = round(own, 3)
+        others = median(list(deltas.values()))
+        if others >= CHURN_MIN_CPU_S:
+            record['received_work'] = own >= others * CHURN_WORK_SHARE
+        return record
+    
+    def analyze_churn(self, begin, events, sent, bucket, recovery_fraction, work):
+        """Bucket completions over time and relate throughput to membership events"""
+        completions = sorted(
+            self.end_times[t] - begin for t in self.latencies() if t.startswith('churn-')
+        )
+        horizon = max(completions[-1] if completions else 0.0, events[-1][0] if events else 0.0)
+        buckets = [0] * (int(horizon / bucket) + 1)
+        for t in completions:
+            buckets[int(t / bucket)] += 1
+        throughput = [count / bucket for count in buckets]
+        
+        first_event = events[0][0] if events else horizon
+        # Skip the very first bucket, which includes startup
+        steady = throughput[1:max(2, int(first_event / bucket))]
+        baseline = percentile(steady, 50) if steady else 0.0
+        
+        report = {
+            'sent': sent,
+            'completed': len(completions),
+            'baseline_throughput': round(baseline, 3),
+            'events': [{'t': round(t, 2), 'event': e, 'worker': w} for t, e, w in events],
+            'joins': [],
+        }
+        
+        dips = []
+        for i, (t, kind, worker_id) in enumerate(events):
+            next_t = events[i + 1][0] if i + 1 < len(events) else horizon
+            window = throughput[int(t / bucket):int(next_t / bucket) + 1]
+            
+            if kind == 'leave' and window and baseline:
+                dips.append(min(window) / baseline)
+            
+            if kind == 'join':
+                recovery = None
+                for j, value in enumerate(window):
+                    if value >= baseline * recovery_fraction:
+                        recovery = round(max(0.0, (int(t / bucket) + j + 1) * bucket - t), 2)
+                        break
+                
+                report['joins'].append({
+                    't': round(t, 2),
+                    'worker': worker_id,
+                    'recovery_s': recovery,
+                    'received_work': None,
+                    'work_tasks': None,
+                    'work_cpu_s': None,
+                    **work.get(i, {}),
+                })
+        
+        if dips:
+            report['worst_dip_ratio'] = round(min(dips), 3)
+        recoveries = [j['recovery_s'] for j in report['joins'] if j['recovery_s'] is not None]
+        if recoveries:
+            report['max_recovery_s'] = max(recoveries)
+        return report
+    
+    def raise_fd_limit(self, needed):
+        """Raise RLIMIT_NOFILE towards `needed` descriptors; returns the new soft limit"""
+        try:
+            import resource
+        except ImportError:
+            # Not available on Windows
+            return None
+        
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        if target > soft:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        return soft
+    
+    def measure_connection_level(self, num_connections, requests_per_connection=3, timeout=30.0):
+        """
+        Open `num_connections` simultaneous client connections, send
+        `requests_per_connection` RPC_REQUESTs on each and wait for replies.
+        Uses a single selector loop so the harness itself scales to thousands.
+        """
+        sel = selectors.DefaultSelector()
+        conns = []
+        payload = '1,2\\3,4|5,6\\7,8'
+        
+        for i in range(num_connections):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            state = {
+                'id': i, 'sock': sock, 'start': time.time(), 'connected': None,
+                'first_response': None, 'last_response': None, 'responses': 0,
+                'buffer': b'', 'failed': False,
+            }
+            err = sock.connect_ex((self.master_host, self.master_port))
+            if err not in CONNECT_PENDING:
+                state['failed'] = True
+                sock.close()
+            else:
+                sel.register(sock, selectors.EVENT_WRITE, state)
+            conns.append(state)
+        
+        pending = sum(1 for c in conns if not c['failed'])
+        deadline = time.time() + timeout
+        while pending and time.time() < deadline:
+            for key, mask in sel.select(timeout=0.5):
+                state = key.data
+                sock = state['sock']
+                
+                if state['connected'] is None:
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                        state['failed'] = True
+                        sel.unregister(sock)
+                        sock.close()
+                        pending -= 1
+                        continue
+                    state['connected'] = time.time()
+                    frames = b''.join(
+                        self.build_message(f"conn{state['id']}-{r}", 'MATRIX_MULTIPLY', payload)
+                        for r in range(requests_per_connection)
+                    )
+                    try:
+                        # Small frames fit in the socket buffer of a fresh connection
+                        self.send_frame(sock, frames)
+                    except OSError:
+                        state['failed'] = True
+                        sel.unregister(sock)
+                        sock.close()
+                        pending -= 1
+                        continue
+                    sel.modify(sock, selectors.EVENT_READ, state)
+                    continue
+                
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    data = b''
+                if not data:
+                    sel.unregister(sock)
+                    sock.close()
+                    pending -= 1
+                    continue
+                
+                state['buffer'] += data
+                *lines, state['buffer'] = state['buffer'].split(b'\n')
+                for line in lines:
+                    self.received(sock, line)
+                    try:
+                        msg = json.loads(line)
+                    except ValueError:
+                        continue
+                    if msg.get('messageType') in RESPONSE_TYPES:
+                        now = time.time()
+                        state['first_response'] = state['first_response'] or now
+                        state['last_response'] = now
+                        state['responses'] += 1
+                
+                if state['responses'] >= requests_per_connection:
+                    sel.unregister(sock)
+                    sock.close()
+                    pending -= 1
+        
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+        
+        connect_ms = [(c['connected'] - c['start']) * 1000 for c in conns if c['connected']]
+        first_ms = [(c['first_response'] - c['connected']) * 1000 for c in conns if c['first_response']]
+        per_conn = [
+            c['responses'] / (c['last_response'] - c['connected'])
+            for c in conns if c['responses'] and c['last_response'] > c['connected']
+        ]
+        completed = sum(1 for c in conns if c['responses'] >= requests_per_connection)
+        responses = sum(c['responses'] for c in conns)
+        last = max((c['last_response'] for c in conns if c['last_response']), default=None)
+        begin = min(c['start'] for c in conns) if conns else 0
+        
+        return {
+            'connections': num_connections,
+            'connect_failed': sum(1 for c in conns if c['failed'] and not c['connected']),
+            'completed_connections': completed,
+            'success_ratio': round(completed / num_connections, 4) if num_connections else 0.0,
+            'connect_p50_ms': round(percentile(connect_ms, 50), 3) if connect_ms else None,
+            'connect_p99_ms': round(percentile(connect_ms, 99), 3) if connect_ms else None,
+            'first_response_p50_ms': round(percentile(first_ms, 50), 3) if first_ms else None,
+            'first_response_p99_ms': round(percentile(first_ms, 99), 3) if first_ms else None,
+            'per_connection_throughput_p50': round(percentile(per_conn, 50), 3) if per_conn else None,
+            'aggregate_throughput': round(responses / (last - begin), 3) if last and last > begin else 0.0,
+        }
+    
+    def run_connection_scaling_test(self, levels=(1, 10, 100, 500, 1000, 2000, 4000),
+                                    requests_per_connection=3, level_timeout=30.0,
+                                    min_success_ratio=0.95, latency_collapse_factor=10.0):
+        """
+        Ramp the number of simultaneous clients and report where the master's
+        connection handling collapses: failed connections, unanswered requests
+        or first-response latency far above the single-client baseline.
+        """
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            limit = self.raise_fd_limit(max(levels) + 256)
+            print(f"[TEST] Connection scaling: levels {list(levels)}, fd limit {limit}")
+            
+            report = {'levels': [], 'requests_per_connection': requests_per_connection}
+            baseline_p99 = None
+            collapse = None
+            
+            for level in levels:
+                if limit is not None and level + 64 > limit:
+                    print(f"[TEST] Skipping {level} connections: fd limit {limit} too low")
+                    break
+                
+                metrics = self.measure_connection_level(level, requests_per_connection, level_timeout)
+                report['levels'].append(metrics)
+                for key, value in metrics.items():
+                    if key != 'connections' and value is not None:
+                        report[f'c{level}_{key}'] = value
+                
+                p99 = metrics['first_response_p99_ms']
+                if baseline_p99 is None and p99:
+                    baseline_p99 = p99
+                print(f"[TEST] {level} connections: success {metrics['success_ratio'] * 100:.1f}%, "
+                      f"connect p99 {metrics['connect_p99_ms']} ms, first response p99 {p99} ms, "
+                      f"{metrics['aggregate_throughput']} responses/s")
+                
+                reasons = []
+                if metrics['success_ratio'] < min_success_ratio:
+                    reasons.append(f"only {metrics['success_ratio'] * 100:.1f}% of connections completed")
+                if baseline_p99 and p99 and p99 > max(baseline_p99 * latency_collapse_factor, 1000.0):
+                    reasons.append(f"first-response p99 {p99:.0f} ms vs {baseline_p99:.0f} ms baseline")
+                if reasons:
+                    collapse = level
+                    report['collapse_reason'] = '; '.join(reasons)
+                    print(f"[TEST] Master collapsed at {level} connections: {report['collapse_reason']}")
+                    break
+                report['max_stable_connections'] = level
+                
+                # Let the master reap closed connections before the next level
+                time.sleep(1)
+            
+            if collapse is not None:
+                report['collapse_connections'] = collapse
+            self.results['connection_scaling'] = report
+            
+            return report.get('max_stable_connections', 0) > 0
+        except Exception as e:
+            self.errors.append(f"Connection scaling test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+    
+    def build_malformed(self, kind, seq, oversized_bytes=1 << 20):
+        """A protocol-violating frame of the given kind"""
+        valid = {
+            "magic": "CSM218",
+            "version": 1,
+            "messageType": "RPC_REQUEST",
+            "studentId": "integration-test",
+            "timestamp": int(time.time() * 1000),
+            "payload": f"bad-{seq};MATRIX_MULTIPLY;1,2\\3,4|5,6\\7,8"
+        }
+        if kind == 'bad_magic':
+            valid["magic"] = "CSM812"
+        elif kind == 'bad_version':
+            valid["version"] = 99
+        elif kind == 'truncated_json':
+            text = json.dumps(valid)
+            return (text[:len(text) // 2] + '\n').encode('utf-8')
+        elif kind == 'oversized_field':
+            valid["studentId"] = "x" * oversized_bytes
+            valid["messageType"] = "R" * 65536
+        return (json.dumps(valid) + '\n').encode('utf-8')
+    
+    def flood_phase(self, prefix, duration, rate, malformed_fraction, stall_timeout, rng, oversized_bytes, listener):
+        """
+        Send frames at `rate`/s for `duration`, a fraction of them malformed.
+        Returns the phase stats and the (possibly replaced) response listener.
+        """
+        payload = '1,2\\3,4|5,6\\7,8'
+        stats = {'valid_sent': 0, 'malformed_sent': 0, 'drops': 0, 'stalls': 0,
+                 'by_kind': {kind: 0 for kind in MALFORMED_KINDS}}
+        valid_ids = []
+        begin = time.time()
+        next_send = begin
+        last_progress = begin
+        completed = 0
+        stalled = False
+        
+        while time.time() - begin < duration:
+            now = time.time()
+            if now >= next_send:
+                try:
+                    if rng.random() < malformed_fraction:
+                        kind = MALFORMED_KINDS[stats['malformed_sent'] % len(MALFORMED_KINDS)]
+                        self.send_frame(self.master_socket, self.build_malformed(kind, stats['malformed_sent'], oversized_bytes))
+                        stats['malformed_sent'] += 1
+                        stats['by_kind'][kind] += 1
+                    else:
+                        task_id = f"{prefix}-{stats['valid_sent']}"
+                        self.start_times[task_id] = time.time()
+                        self.send_frame(self.master_socket, self.build_message(task_id, 'MATRIX_MULTIPLY', payload))
+                        valid_ids.append(task_id)
+                        stats['valid_sent'] += 1
+                except OSError:
+                    listener.join(timeout=1)
+                next_send += 1.0 / rate
+            
+            # The master closed the connection: count it and reconnect
+            if not listener.is_alive():
+                stats['drops'] += 1
+                self.master_socket.close()
+                if not self.connect_to_master():
+                    break
+                listener = self.start_response_listener()
+            
+            done = sum(1 for t in valid_ids if t in self.end_times)
+            if done > completed:
+                completed = done
+                last_progress = now
+                stalled = False
+            elif done < len(valid_ids) and now - last_progress > stall_timeout and not stalled:
+                stats['stalls'] += 1
+                stalled = True
+            
+            time.sleep(max(0.0, next_send - time.time()))
+        
+        # Let outstanding valid requests finish
+        time.sleep(min(2.0, stall_timeout))
+        latencies = list(self.latencies(valid_ids).values())
+        stats['valid_completed'] = len(latencies)
+        stats['throughput'] = round(len(latencies) / duration, 3)
+        if latencies:
+            stats['latency_p50_ms'] = round(percentile(latencies, 50) * 1000, 3)
+            stats['latency_p99_ms'] = round(percentile(latencies, 99) * 1000, 3)
+        return stats, listener
+    
+    def run_malformed_flood_test(self, duration=20.0, rate=200.0, malformed_fraction=0.5,
+                                 baseline_duration=5.0, stall_timeout=5.0, oversized_bytes=1 << 20, seed=218):
+        """
+        Measure how valid-request latency and throughput degrade when the
+        master's parser is flooded with malformed CSM218 frames (wrong magic,
+        wrong version, truncated JSON, oversized fields), and whether the
+        master drops the connection or stalls.
+        """
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            if not self.connect_to_master():
+                return False
+            
+            rng = random.Random(seed)
+            print(f"[TEST] Malformed flood: baseline {baseline_duration:.0f}s, then {duration:.0f}s at "
+                  f"{rate:.0f} frames/s with {malformed_fraction * 100:.0f}% malformed")
+            listener = self.start_response_listener()
+            baseline, listener = self.flood_phase('base', baseline_duration, rate * (1 - malformed_fraction),
+                                                  0.0, stall_timeout, rng, oversized_bytes, listener)
+            flood, listener = self.flood_phase('flood', duration, rate, malformed_fraction,
+                                               stall_timeout, rng, oversized_bytes, listener)
+            
+            report = {'malformed_fraction': malformed_fraction, 'frame_rate': rate}
+            for phase, stats in (('baseline', baseline), ('flood', flood)):
+                for key, value in stats.items():
+                    report[f'{phase}_{key}'] = value
+            if baseline.get('latency_p99_ms') and flood.get('latency_p99_ms'):
+                report['latency_p99_degradation'] = round(flood['latency_p99_ms'] / baseline['latency_p99_ms'], 3)
+            if baseline['throughput']:
+                report['throughput_ratio'] = round(flood['throughput'] / baseline['throughput'], 3)
+            self.results['malformed_flood'] = report
+            
+            print(f"[TEST] Valid p99: {baseline.get('latency_p99_ms')} ms -> {flood.get('latency_p99_ms')} ms, "
+                  f"throughput {baseline['throughput']} -> {flood['throughput']} req/s, "
+                  f"{flood['drops']} drop(s), {flood['stalls']} stall(s)")
+            
+            # A robust master keeps the connection and keeps answering valid requests
+            return flood['drops'] == 0 and flood['stalls'] == 0 and flood['valid_completed'] > 0
+        except Exception as e:
+            self.errors.append(f"Malformed flood test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+    
+    def socket_queues(self, local_port, remote_port):
+        """
+        (tx_queue, rx_queue) in bytes of the TCP socket with the given local and
+        remote ports, read from /proc/net/tcp{,6}; None if not found.
+        """
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table, 'r') as f:
+                    next(f)
+                    for line in f:
+                        fields = line.split()
+                        local = int(fields[1].rsplit(':', 1)[1], 16)
+                        remote = int(fields[2].rsplit(':', 1)[1], 16)
+                        if local == local_port and remote == remote_port:
+                            tx, rx = fields[4].split(':')
+                            return int(tx, 16), int(rx, 16)
+            except (OSError, StopIteration, IndexError, ValueError):
+                continue
+        return None
+    
+    def run_slow_consumer_test(self, duration=60.0, submit_rate=200.0, read_rate=2048,
+                               sample_interval=1.0, recv_buffer=4096, rss_growth_limit_mb_per_min=5.0):
+        """
+        Submit tasks quickly but read responses at a throttled `read_rate`
+        (bytes/s) through a small receive buffer. Samples master RSS and the
+        master's kernel send queue to detect and quantify unbounded
+        buffering of responses inside the master.
+        """
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Must be set before connect to bound the advertised window
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer)
+            sock.connect((self.master_host, self.master_port))
+            self.master_socket = sock
+            client_port = sock.getsockname()[1]
+            
+            print(f"[TEST] Slow consumer: submitting {submit_rate:.0f} tasks/s, reading {read_rate} B/s "
+                  f"for {duration:.0f}s")
+            stop = threading.Event()
+            counters = {'submitted': 0, 'submit_blocked_s': 0.0, 'read_bytes': 0, 'responses': 0}
+            payload = '1,2\\3,4|5,6\\7,8'
+            
+            def submit():
+                next_send = time.time()
+                while not stop.is_set():
+                    frame = self.build_message(f"slow-{counters['submitted']}", 'MATRIX_MULTIPLY', payload)
+                    before = time.time()
+                    try:
+                        self.send_frame(sock, frame)
+                    except OSError:
+                        return
+                    # Time spent blocked means the master applied backpressure to us
+                    counters['submit_blocked_s'] += max(0.0, time.time() - before - 0.001)
+                    counters['submitted'] += 1
+                    next_send += 1.0 / submit_rate
+                    time.sleep(max(0.0, next_send - time.time()))
+            
+            def consume():
+                chunk = max(1, int(read_rate / 10))
+                buffer = b''
+                while not stop.is_set():
+                    try:
+                        data = sock.recv(chunk)
+                    except OSError:
+                        return
+                    if not data:
+                        return
+                    counters['read_bytes'] += len(data)
+                    buffer += data
+                    *lines, buffer = buffer.split(b'\n')
+                    for line in lines:
+                        self.received(sock, line)
+                        try:
+                            msg = json.loads(line)
+                        except ValueError:
+                            continue
+                        # Heartbeats and acks are read too, but only responses drain the backlog
+                        if isinstance(msg, dict) and msg.get('messageType') in RESPONSE_TYPES:
+                            counters['responses'] += 1
+                    time.sleep(len(data) / read_rate)
+            
+            threads = [threading.Thread(target=submit, daemon=True), threading.Thread(target=consume, daemon=True)]
+            for t in threads:
+                t.start()
+            
+            samples = []
+            begin = time.time()
+            while time.time() - begin < duration:
+                time.sleep(sample_interval)
+                queues = self.socket_queues(self.master_port, client_port)
+                samples.append({
+                    't': time.time() - begin,
+                    'rss': self.sample_rss(self.master_process),
+                    'master_send_q': queues[0] if queues else None,
+                    'submitted': counters['submitted'],
+                    'responses': counters['responses'],
+                })
+            stop.set()
+            
+            report = {
+                'duration_s': duration,
+                'submit_rate': submit_rate,
+                'read_rate_bytes': read_rate,
+                'submitted': counters['submitted'],
+                'responses_read': counters['responses'],
+                'submit_blocked_s': round(counters['submit_blocked_s'], 3),
+                'flags': [],
+            }
+            if counters['responses']:
+                # Responses the master has produced but we have not consumed yet
+                report['unread_responses'] = counters['submitted'] - counters['responses']
+            
+            send_q = [x['master_send_q'] for x in samples if x['master_send_q'] is not None]
+            if send_q:
+                report['master_send_q_max_bytes'] = max(send_q)
+            
+            rss = [(x['t'], x['rss']) for x in samples[len(samples) // 10:] if x['rss'] is not None]
+            fit = linear_fit([t for t, _ in rss], [r for _, r in rss])
+            if fit:
+                slope, _, r_squared = fit
+                growth = slope * 60 / (1 << 20)
+                report['master_rss_growth_mb_per_min'] = round(growth, 4)
+                report['master_rss_final_mb'] = round(rss[-1][1] / (1 << 20), 2)
+                report['master_rss_growth_mb'] = round((rss[-1][1] - rss[0][1]) / (1 << 20), 2)
+                if growth > rss_growth_limit_mb_per_min and r_squared > 0.5:
+                    report['flags'].append(
+                        f"Master RSS grows {growth:.2f} MB/min while the client is throttled "
+                        f"(r2={r_squared:.2f}): responses are buffered without bound"
+                    )
+            self.results['slow_consumer'] = report
+            
+            print(f"[TEST] Slow consumer: {report['submitted']} submitted, {report['responses_read']} read, "
+                  f"send-Q max {report.get('master_send_q_max_bytes')} B, "
+                  f"RSS growth {report.get('master_rss_growth_mb_per_min')} MB/min, "
+                  f"submitter blocked {report['submit_blocked_s']}s")
+            for flag in report['flags']:
+                print(f"[TEST] Slow consumer: {flag}")
+            
+            return not report['flags']
+        except Exception as e:
+            self.errors.append(f"Slow consumer test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+    
+    def mixed_phase(self, name, mix, duration, rate, route, only=None):
+        """
+        Send tasks drawn from `mix` at `rate`/s for `duration`. `route` maps a
+        size class to the socket it is sent on. Returns task ids per class.
+        """
+        ids = {}
+        begin = time.time()
+        next_send = begin
+        seq = 0
+        
+        while time.time() - begin < duration:
+            size_class, task_type, payload = mix.draw(only)
+            task_id = f'{name}-{size_class}-{seq}'
+            if not self.send_task(task_id, task_type, payload, verbose=False, sock=route(size_class)):
+                break
+            ids.setdefault(size_class, []).append(task_id)
+            seq += 1
+            next_send += 1.0 / rate
+            time.sleep(max(0.0, next_send - time.time()))
+        
+        return ids
+    
+    def class_latencies(self, ids):
+        """Latency percentiles (ms) and completion counts per size class"""
+        report = {}
+        for size_class, task_ids in ids.items():
+            values = list(self.latencies(task_ids).values())
+            report[size_class] = {'sent': len(task_ids), 'completed': len(values)}
+            if values:
+                report[size_class].update({
+                    'p50_ms': round(percentile(values, 50) * 1000, 3),
+                    'p95_ms': round(percentile(values, 95) * 1000, 3),
+                    'p99_ms': round(percentile(values, 99) * 1000, 3),
+                })
+        return report
+    
+    def run_hol_blocking_test(self, duration=30.0, rate=50.0, baseline_duration=10.0,
+                              drain_timeout=30.0, size_classes=None, starvation_factor=5.0):
+        """
+        Head-of-line blocking benchmark: many small MATRIX_MULTIPLY tasks mixed
+        with occasional large multiplies and BLOCK_TRANSPOSE tasks. Latency is
+        reported per size class for three phases: small tasks alone, the mix
+        on one shared connection, and the mix with large tasks on their own
+        connection. Small-task p99 inflation shows whether big tasks starve
+        small ones per connection or per worker.
+        """
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            if not self.connect_to_master():
+                return False
+            
+            self.start_response_listener()
+            side = self.open_connection()
+            self.start_response_listener(side)
+            mix = WorkloadMix(size_classes)
+            small = mix.names[0]
+            
+            print(f"[TEST] HOL blocking: {rate:.0f} tasks/s, classes "
+                  + ', '.join(f"{n}={t}/{d}x{d}" for n, (t, d, _) in mix.size_classes.items()))
+            
+            phases = {}
+            phases['baseline'] = self.mixed_phase('base', mix, baseline_duration, rate,
+                                                  lambda c: self.master_socket, only=[small])
+            phases['shared'] = self.mixed_phase('shared', mix, duration, rate,
+                                                lambda c: self.master_socket)
+            phases['split'] = self.mixed_phase('split', mix, duration, rate,
+                                               lambda c: self.master_socket if c == small else side)
+            
+            # Wait for stragglers so large-task latencies are complete
+            outstanding = [t for ids in phases.values() for lst in ids.values() for t in lst]
+            deadline = time.time() + drain_timeout
+            while time.time() < deadline and any(t not in self.end_times for t in outstanding):
+                time.sleep(0.2)
+            side.close()
+            
+            report = {'rate': rate}
+            per_phase = {phase: self.class_latencies(ids) for phase, ids in phases.items()}
+            for phase, classes in per_phase.items():
+                for size_class, metrics in classes.items():
+                    for key, value in metrics.items():
+                        report[f'{phase}_{size_class}_{key}'] = value
+                    print(f"[TEST] {phase:8s} {size_class:10s} p50 {metrics.get('p50_ms')} ms, "
+                          f"p99 {metrics.get('p99_ms')} ms ({metrics['completed']}/{metrics['sent']})")
+            
+            base_p99 = per_phase['baseline'].get(small, {}).get('p99_ms')
+            starved = []
+            for phase in ('shared', 'split'):
+                p99 = per_phase[phase].get(small, {}).get('p99_ms')
+                if base_p99 and p99:
+                    inflation = round(p99 / base_p99, 3)
+                    report[f'{phase}_small_p99_inflation'] = inflation
+                    if inflation > starvation_factor:
+                        starved.append(phase)
+            report['starved_phases'] = starved
+            self.results['hol_blocking'] = report
+            
+            if starved:
+                print(f"[TEST] Small tasks starved by large ones in: {', '.join(starved)}")
+            return not starved
+        except Exception as e:
+            self.errors.append(f"HOL blocking test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+    
+    def run_fairness_test(self, duration=30.0, tenants=None, fairness_threshold=0.8):
+        """
+        Multi-tenant fairness: several client identities (distinct studentId,
+        one connection each) submit at different offered loads concurrently.
+        Reports per-client throughput and latency percentiles plus Jain's
+        fairness index over raw throughput and over throughput/offered load.
+        """
+        tenants = tenants or [("tenant-a", 5.0), ("tenant-b", 20.0), ("tenant-c", 80.0)]
+        conns = []
+        try:
+            if not self.start_master():
+                return False
+            
+            if not self.start_workers():
+                return False
+            
+            print(f"[TEST] Fairness: {len(tenants)} clients for {duration:.0f}s at "
+                  + ', '.join(f"{sid}={rate:.0f}/s" for sid, rate in tenants))
+            payload = '1,2\\3,4|5,6\\7,8'
+            sent = {sid: [] for sid, _ in tenants}
+            
+            def submit(student_id, rate, sock):
+                begin = time.time()
+                next_send = begin
+                while time.time() - begin < duration:
+                    task_id = f'{student_id}-{len(sent[student_id])}'
+                    if not self.send_task(task_id, 'MATRIX_MULTIPLY', payload, verbose=False,
+                                          sock=sock, student_id=student_id):
+                        return
+                    sent[student_id].append(task_id)
+                    next_send += 1.0 / rate
+                    time.sleep(max(0.0, next_send - time.time()))
+            
+            threads = []
+            for student_id, rate in tenants:
+                sock = self.open_connection()
+                conns.append(sock)
+                self.start_response_listener(sock)
+                threads.append(threading.Thread(target=submit, args=(student_id, rate, sock), daemon=True))
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            
+            # Grace period for in-flight requests
+            time.sleep(2)
+            
+            report = {'clients': len(tenants)}
+            throughputs = []
+            normalized = []
+            for student_id, rate in tenants:
+                values = list(self.latencies(sent[student_id]).values())
+                throughput = len(values) / duration
+                throughputs.append(throughput)
+                normalized.append(throughput / rate if rate else None)
+                report[f'{student_id}_offered_per_s'] = rate
+                report[f'{student_id}_throughput'] = round(throughput, 3)
+                if values:
+                    report[f'{student_id}_p50_ms'] = round(percentile(values, 50) * 1000, 3)
+                    report[f'{student_id}_p95_ms'] = round(percentile(values, 95) * 1000, 3)
+                    report[f'{student_id}_p99_ms'] = round(percentile(values, 99) * 1000, 3)
+                print(f"[TEST] {student_id}: offered {rate:.1f}/s, got {throughput:.1f}/s, "
+                      f"p99 {report.get(f'{student_id}_p99_ms')} ms")
+            
+            jain_raw = jain_index(throughputs)
+            jain_norm = jain_index(normalized)
+            report['jain_fairness_throughput'] = round(jain_raw, 4) if jain_raw is not None else None
+            report['jain_fairness_normalized'] = round(jain_norm, 4) if jain_norm is not None else None
+            self.results['fairness'] = report
+            
+            print(f"[TEST] Jain's index: raw {report['jain_fairness_throughput']}, "
+                  f"demand-normalized {report['jain_fairness_normalized']}")
+            return jain_norm is not None and jain_norm >= fairness_threshold
+        except Exception as e:
+            self.errors.append(f"Fairness test error: {e}")
+            return False
+        finally:
+            for sock in conns:
+                sock.close()
+            self.cleanup()
+    
+    def run_wire_efficiency_test(self, sizes=(2, 16, 64, 128), tasks_per_size=5, timeout=60.0):
+        """
+        Bytes on the wire per matrix element. Workers reach the master through
+        a counting proxy, so both the client protocol and the submission's own
+        worker framing are measured. Each size sends MATRIX_MULTIPLY tasks and
+        reports bytes per element (operands plus n*n result elements) and the
+        overhead ratio against 4-byte binary integers.
+        """
+        proxy = None
+        try:
+            if not self.start_master():
+                return False
+            
+            self.wire = WireCounter()
+            proxy = WireProxy(self.master_host, self.master_host, self.master_port, self.wire)
+            self.worker_master_port = proxy.start()
+            print(f"[TEST] Wire proxy on {self.master_host}:{self.worker_master_port} -> master")
+            
+            if not self.start_workers():
+                return False
+            if not self.connect_to_master():
+                return False
+            self.start_response_listener()
+            
+            rng = random.Random(218)
+            report = {'tasks_per_size': tasks_per_size}
+            all_completed = True
+            for n in sizes:
+                before = self.wire.snapshot()
+                task_ids = []
+                elements = 0
+                for i in range(tasks_per_size):
+                    payload = task_payload('MATRIX_MULTIPLY', n, rng)
+                    task_id = f'wire-{n}-{i}'
+                    if self.send_task(task_id, 'MATRIX_MULTIPLY', payload, verbose=False):
+                        task_ids.append(task_id)
+                        elements += matrix_elements(payload) + n * n
+                completed = self.wait_for(task_ids, timeout)
+                all_completed = all_completed and completed
+                # Let trailing acknowledgements between master and workers arrive
+                time.sleep(0.5)
+                counts = WireCounter.delta(self.wire.snapshot(), before)
+                
+                client = (WireCounter.total(counts, 'client_to_master')
+                          + WireCounter.total(counts, 'master_to_client'))
+                workers = (WireCounter.total(counts, 'master_to_worker')
+                           + WireCounter.total(counts, 'worker_to_master'))
+                prefix = f'n{n}'
+                report[f'{prefix}_completed'] = sum(1 for t in task_ids if t in self.end_times)
+                report[f'{prefix}_elements'] = elements
+                report[f'{prefix}_request_bytes'] = WireCounter.total(counts, 'client_to_master', 'RPC_REQUEST')
+                report[f'{prefix}_client_bytes'] = client
+                report[f'{prefix}_worker_link_bytes'] = workers
+                if elements:
+                    report[f'{prefix}_client_bytes_per_element'] = round(client / elements, 3)
+                    report[f'{prefix}_client_overhead_ratio'] = round(client / (4 * elements), 3)
+                    report[f'{prefix}_worker_bytes_per_element'] = round(workers / elements, 3)
+                    report[f'{prefix}_worker_overhead_ratio'] = round(workers / (4 * elements), 3)
+                report[f'{prefix}_by_type'] = counts
+                
+                print(f"[TEST] {n}x{n}: client {report.get(f'{prefix}_client_bytes_per_element')} B/element, "
+                      f"worker link {report.get(f'{prefix}_worker_bytes_per_element')} B/element "
+                      f"({report[f'{prefix}_completed']}/{len(task_ids)} completed)")
+            
+            self.results['wire_efficiency'] = report
+            return all_completed
+        except Exception as e:
+            self.errors.append(f"Wire efficiency test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+            if proxy:
+                proxy.stop()
+            self.wire = None
+            self.worker_master_port = None
+    
+    def large_operands(self, n, count, seed=218):
+        """`count` random n x n .npy operands, generated once and reused"""
+        os.makedirs(WORKLOAD_DIR, exist_ok=True)
+        paths = []
+        for i in range(count):
+            path = os.path.join(WORKLOAD_DIR, f"matrix-{n}-{seed}-{i}.npy")
+            if not os.path.exists(path):
+                print(f"[TEST] Generating {path}")
+                write_random_npy(path, n, random.Random(seed + i))
+            paths.append(path)
+        return [NpyMatrix(path) for path in paths]
+    
+    def run_large_matrix_test(self, n=2048, total_gb=1.0, max_in_flight=2, timeout=300.0):
+        """
+        Large-matrix throughput: MATRIX_MULTIPLY tasks with n x n operands
+        streamed from memory-mapped .npy files until `total_gb` of payload has
+        been sent. Reports payload throughput, latency, master RSS and the
+        harness's own RSS, which should stay flat however much is sent.
+        """
+        operands = []
+        try:
+            operands = self.large_operands(n, 4)
+            pairs = [(operands[0], operands[1]), (operands[2], operands[3])]
+            # Two single-digit values and separators per element
+            per_task = 2 * 2 * n * n
+            tasks = max(1, -(-int(total_gb * 1e9) // per_task))
+            
+            if not self.start_master():
+                return False
+            if not self.start_workers():
+                return False
+            if not self.connect_to_master():
+                return False
+            self.start_response_listener()
+            
+            print(f"[TEST] Large matrices: {tasks} tasks of {n}x{n} (~{per_task / 1e6:.0f} MB each)")
+            rss_start = self.sample_rss(os.getpid())
+            rss_peak = rss_start or 0
+            master_peak = 0
+            task_ids = []
+            sent_bytes = 0
+            begin = time.time()
+            deadline = begin + timeout
+            
+            for i in range(tasks):
+                # Bound the work queued at the master
+                while len(task_ids) - sum(1 for t in task_ids if t in self.end_times) >= max_in_flight:
+                    if time.time() > deadline:
+                        break
+                    time.sleep(0.01)
+                if time.time() > deadline:
+                    break
+                task_id = f'large-{n}-{i}'
+                sent_bytes += self.send_streamed_task(task_id, 'MATRIX_MULTIPLY', pairs[i % len(pairs)])
+                task_ids.append(task_id)
+                rss_peak = max(rss_peak, self.sample_rss(os.getpid()) or 0)
+                master_peak = max(master_peak, self.sample_rss(self.master_process) or 0)
+            send_s = time.time() - begin
+            
+            self.wait_for(task_ids, max(0.0, deadline - time.time()))
+            rss_peak = max(rss_peak, self.sample_rss(os.getpid()) or 0)
+            values = list(self.latencies(task_ids).values())
+            
+            mb = 1 << 20
+            report = {
+                'matrix_size': n,
+                'tasks': len(task_ids),
+                'completed': len(values),
+                'payload_gb': round(sent_bytes / 1e9, 3),
+                'send_mb_per_s': round(sent_bytes / mb / send_s, 3) if send_s else None,
+                'harness_rss_start_mb': round(rss_start / mb, 1) if rss_start else None,
+                'harness_rss_peak_mb': round(rss_peak / mb, 1),
+                'master_rss_peak_mb': round(master_peak / mb, 1),
+            }
+            if rss_start:
+                report['harness_rss_growth_mb'] = round((rss_peak - rss_start) / mb, 1)
+            if values:
+                report['p50_ms'] = round(percentile(values, 50) * 1000, 3)
+                report['p99_ms'] = round(percentile(values, 99) * 1000, 3)
+            self.results['large_matrix'] = report
+            
+            print(f"[TEST] Sent {report['payload_gb']} GB at {report['send_mb_per_s']} MB/s, "
+                  f"{report['completed']}/{report['tasks']} completed, harness RSS "
+                  f"{report['harness_rss_start_mb']} -> {report['harness_rss_peak_mb']} MB")
+            return len(values) == tasks
+        except Exception as e:
+            self.errors.append(f"Large matrix test error: {e}")
+            return False
+        finally:
+            self.cleanup()
+            for matrix in operands:
+                matrix.close()
+    
+    def analyze_soak(self, rss_samples, latency_samples, sent, duration,
+                     rss_growth_limit_mb_per_min, latency_drift_limit):
+        """Fit trends to soak samples and flag memory growth and latency drift"""
+        report = {
+            'duration_s': round(duration, 1),
+            'sent': sent,
+            'completed': len(self.latencies()),
+            'flags': [],
+        }
+        all_latencies = list(self.latencies().values())
+        if all_latencies:
+            report['latency_p50_ms'] = round(percentile(all_latencies, 50) * 1000, 3)
+            report['latency_p99_ms'] = round(percentile(all_latencies, 99) * 1000, 3)
+        
+        for name, samples in rss_samples.items():
+            # Skip the first 10% of samples: heap sizing and JIT warmup dominate there
+            steady = samples[len(samples) // 10:]
+            fit = linear_fit([t for t, _ in steady], [rss for _, rss in steady])
+            if not fit:
+                continue
+            slope, _, r_squared = fit
+            growth = slope * 60 / (1 << 20)
+            report[f'{name}_rss_final_mb'] = round(steady[-1][1] / (1 << 20), 2)
+            report[f'{name}_rss_growth_mb_per_min'] = round(growth, 4)
+            if growth > rss_growth_limit_mb_per_min and r_squared > 0.5:
+                report['flags'].append(f"{name} RSS grows {growth:.2f} MB/min (r2={r_squared:.2f})")
+        
+        fit = linear_fit([t for t, _ in latency_samples], [lat for _, lat in latency_samples])
+        if fit:
+            slope, intercept, r_squared = fit
+            start_latency = max(intercept, 1e-6)
+            drift = slope * duration / start_latency
+            report['latency_drift_ratio'] = round(drift, 4)
+            if drift > latency_drift_limit and r_squared > 0.5:
+                report['flags'].append(f"Latency drifts +{drift * 100:.0f}% over the run (r2={r_squared:.2f})")
+        
+        if sent and report['completed'] < sent * 0.99:
+            report['flags'].append(f"Only {report['completed']}/{sent} tasks completed")
+        
+        return report
 
 def main():
     """Run integration tests"""
+    import argparse
+    parser = argparse.ArgumentParser(description='CSM218 integration test harness')
+    parser.add_argument('--soak', type=float, metavar='SECONDS', help='Run only the soak test for this many seconds')
+    parser.add_argument('--rate', type=float, default=5.0, help='Request rate for soak/churn tests (tasks/s)')
+    parser.add_argument('--sample-interval', type=float, default=10.0, help='Soak test RSS/latency sampling interval (s)')
+    parser.add_argument('--churn', type=float, metavar='SECONDS', help='Run only the worker churn test for this many seconds')
+    parser.add_argument('--churn-interval', type=float, default=10.0, help='Seconds between worker leave/join events')
+    parser.add_argument('--connections', type=str, metavar='LEVELS', help='Run only the connection scaling test, e.g. 1,10,100,1000,4000')
+    parser.add_argument('--flood', type=float, metavar='SECONDS', help='Run only the malformed-frame flood test for this many seconds')
+    parser.add_argument('--malformed-fraction', type=float, default=0.5, help='Fraction of malformed frames during the flood')
+    parser.add_argument('--slow-consumer', type=float, metavar='SECONDS', help='Run only the slow-consumer backpressure test for this many seconds')
+    parser.add_argument('--read-rate', type=int, default=2048, help='Slow consumer read rate (bytes/s)')
+    parser.add_argument('--hol', type=float, metavar='SECONDS', help='Run only the head-of-line blocking benchmark (seconds per mixed phase)')
+    parser.add_argument('--fairness', type=float, metavar='SECONDS', help='Run only the multi-tenant fairness test for this many seconds')
+    parser.add_argument('--wire', type=str, metavar='SIZES', help='Run only the wire-efficiency test for these matrix sizes, e.g. 2,16,64,128')
+    parser.add_argument('--large', type=int, metavar='N', help='Run only the large-matrix test with N x N operands streamed from .npy files')
+    parser.add_argument('--large-total-gb', type=float, default=1.0, help='Total payload for the large-matrix test (GB)')
+    parser.add_argument('--scenario-budget', type=float, metavar='SECONDS', help='Kill a scenario\'s processes once it runs this long')
+    parser.add_argument('--run-budget', type=float, metavar='SECONDS', help='Wall-clock budget for the whole run; later scenarios are skipped')
+    parser.add_argument('--repeat', type=int, default=1, help='Repeat timing scenarios N times and grade on confidence intervals')
+    parser.add_argument('--warmup', type=int, default=1, help='Warmup runs discarded in repeated mode')
+    parser.add_argument('--multi-node', action='store_true', help='Place each process on its own 127.0.0.x address and CPU set')
+    parser.add_argument('--cds', action='store_true', help='Launch JVMs with an AppCDS archive of the build and report startup with/without it')
+    parser.add_argument('--trace', type=str, metavar='PATH', help='Record all protocol traffic to a gzip JSONL trace for replay.py')
+    parser.add_argument('--jfr', type=str, metavar='DIR', help='Record every JVM with Java Flight Recorder into DIR and summarize hotspots')
+    parser.add_argument('--output', type=str, help='Write scenario metrics as JSON to this path')
+    args = parser.parse_args()
+    
     classpath = "build/classes/java/main:build/resources/main"
     
-    harness = IntegrationTestHarness(classpath)
+    harness = IntegrationTestHarness(classpath, multi_node=args.multi_node, jfr_dir=args.jfr,
+                                     trace_path=args.trace, scenario_budget=args.scenario_budget,
+                                     run_budget=args.run_budget)
     
     print("=== Integration Test Harness ===\n")
     
-    tests = [
-        ("Basic Communication", harness.run_basic_test),
-        ("Parallelism Detection", harness.run_parallelism_test),
-        ("Failure Recovery", harness.run_failure_test),
-    ]
+    if args.cds:
+        archive = CdsArchive(master_port=harness.master_port)
+        ok, msg = archive.ensure()
+        print(f"[TEST] {msg}")
+        if ok:
+            harness.results['startup'] = archive.compare_startup(harness)
+            print(f"[TEST] Master startup: {harness.results['startup'].get('master_startup_ms')} ms default, "
+                  f"{harness.results['startup'].get('master_startup_cds_ms')} ms with CDS")
+            harness.classpath = str(archive.jar_path)
+            harness.jvm_options += archive.runtime_options()
+        else:
+            harness.errors.append(f"CDS archive unavailable: {msg}")
+    
+    if args.soak:
+        tests = [
+            ("Soak", lambda: harness.run_soak_test(args.soak, args.rate, args.sample_interval)),
+        ]
+    elif args.churn:
+        tests = [
+            ("Worker Churn", lambda: harness.run_churn_test(args.churn, args.churn_interval, args.rate)),
+        ]
+    elif args.connections:
+        levels = [int(n) for n in args.connections.split(',')]
+        tests = [
+            ("Connection Scaling", lambda: harness.run_connection_scaling_test(levels)),
+        ]
+    elif args.flood:
+        tests = [
+            ("Malformed Flood", lambda: harness.run_malformed_flood_test(args.flood, malformed_fraction=args.malformed_fraction)),
+        ]
+    elif args.slow_consumer:
+        tests = [
+            ("Slow Consumer", lambda: harness.run_slow_consumer_test(args.slow_consumer, read_rate=args.read_rate)),
+        ]
+    elif args.hol:
+        tests = [
+            ("Head-of-Line Blocking", lambda: harness.run_hol_blocking_test(args.hol)),
+        ]
+    elif args.fairness:
+        tests = [
+            ("Multi-Tenant Fairness", lambda: harness.run_fairness_test(args.fairness)),
+        ]
+    elif args.wire:
+        sizes = [int(n) for n in args.wire.split(',')]
+        tests = [
+            ("Wire Efficiency", lambda: harness.run_wire_efficiency_test(sizes)),
+        ]
+    elif args.large:
+        tests = [
+            ("Large Matrices", lambda: harness.run_large_matrix_test(args.large, args.large_total_gb)),
+        ]
+    else:
+        tests = [
+            ("Basic Communication", harness.run_basic_test),
+            ("Parallelism Detection", lambda: harness.run_parallelism_test(args.repeat, args.warmup)),
+            ("Failure Recovery", harness.run_failure_test),
+        ]
     
     results = {}
     for test_name, test_func in tests:
+        if harness.watchdog.run_expired():
+            harness.watchdog.skip(test_name)
+            results[test_name] = False
+            continue
+        harness.scenario = test_name
+        if harness.trace:
+            harness.trace.mark(test_name)
+        harness.watchdog.begin(test_name)
         try:
             result = test_func()
             results[test_name] = result
-            status = "PASS" if result else "FAIL"
-            print(f"{test_name}: {status}\n")
+            status = "INCONCLUSIVE" if result is None else ("PASS" if result else "FAIL")
         except Exception as e:
             results[test_name] = False
-            print(f"{test_name}: FAIL ({e})\n")
+            status = f"FAIL ({e})"
+        if harness.watchdog.end()['expired']:
+            results[test_name] = False
+            status = "FAIL (budget exceeded)"
+        print(f"{test_name}: {status}\n")
+    harness.results['watchdog'] = harness.watchdog.report()
     
     print("\n=== Test Results ===")
     for test_name, passed in results.items():
-        status = "✓" if passed else "✗"
+        status = "?" if passed is None else ("✓" if passed else "✗")
         print(f"{status} {test_name}")
     
     if harness.errors:
         print("\n=== Errors ===")
         for error in harness.errors:
             print(f"- {error}")
+    
+    if harness.trace:
+        harness.trace.close()
+        print(f"\nTraffic trace written to {args.trace}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"scenarios": harness.results, "passed": results}, f, indent=2)
+        print(f"\nScenario metrics written to {args.output}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Helpers for compiling and running the small Java drivers that ship with the
+harness against a submission's compiled pdc classes.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+from watchdog import run_in_group
+
+HARNESS_DIR = Path(__file__).resolve().parent
+DEFAULT_CLASSES_DIR = os.path.join("build", "classes", "java", "main")
+DEFAULT_DRIVER_DIR = os.path.join("build", "autograder", "drivers")
+
+
+def find_java_tool(name):
+    """Locate a JDK tool (java, javac, ...) preferring JAVA_HOME over PATH"""
+    java_home = os.environ.get("JAVA_HOME")
+    if java_home:
+        candidate = os.path.join(java_home, "bin", name)
+        if os.path.exists(candidate):
+            return candidate
+    return shutil.which(name)
+
+
+def driver_classpath(classes_dir=DEFAULT_CLASSES_DIR, driver_dir=DEFAULT_DRIVER_DIR):
+    """Classpath that resolves the submission's classes and the compiled drivers"""
+    return os.pathsep.join([driver_dir, classes_dir])
+
+
+def compile_driver(source_names, classes_dir=DEFAULT_CLASSES_DIR, driver_dir=DEFAULT_DRIVER_DIR, timeout=120):
+    """Compile harness driver sources against the submission's classes"""
+    javac = find_java_tool("javac")
+    if not javac:
+        return False, "javac not found (set JAVA_HOME or add a JDK to PATH)"
+
+    if not os.path.isdir(classes_dir):
+        return False, f"Compiled classes not found in {classes_dir}"
+
+    os.makedirs(driver_dir, exist_ok=True)
+    sources = [str(HARNESS_DIR / name) for name in source_names]
+    cmd = [javac, "-encoding", "UTF-8", "-cp", classes_dir, "-d", driver_dir] + sources
+
+    try:
+        proc = run_in_group(cmd, timeout)
+    except Exception as e:
+        return False, f"Driver compilation error: {e}"
+
+    if proc.returncode != 0:
+        return False, f"Driver compilation failed: {proc.stderr.strip()}"
+    return True, "Driver compiled"
+
+
+def run_driver(main_class, args=(), jvm_options=(), classpath=None, timeout=600):
+    """
+    Run a compiled driver and return the CompletedProcess. The JVM runs in its
+    own process group; the timeout is capped by the grading run's deadline.
+    """
+    java = find_java_tool("java") or "java"
+    cmd = [java] + list(jvm_options) + ["-cp", classpath or driver_classpath(), main_class]
+    cmd += [str(a) for a in args]
+    return run_in_group(cmd, timeout)
+
+
+def parse_json_lines(output):
+    """Extract the JSON objects a driver prints, one per line, ignoring other output"""
+    records = []
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            pass
+    return records
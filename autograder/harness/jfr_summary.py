@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Summarize Java Flight Recorder recordings from harness scenarios into hot
+methods, lock contention and allocation hotspots.
+
+Recordings are condensed by JfrExport.java (jdk.jfr.consumer, built into
+JDK 11) and ranked here.
+"""
+
+import sys
+
+from java_driver import (
+    DEFAULT_CLASSES_DIR,
+    DEFAULT_DRIVER_DIR,
+    compile_driver,
+    driver_classpath,
+    parse_json_lines,
+    run_driver,
+)
+
+# Options for `java` to record a profile that is written when the JVM exits
+JFR_SETTINGS = "profile"
+
+
+def jfr_options(recording_path):
+    return [f"-XX:StartFlightRecording=settings={JFR_SETTINGS},dumponexit=true,filename={recording_path}"]
+
+
+class JfrSummarizer:
+    def __init__(self, classes_dir=DEFAULT_CLASSES_DIR, driver_dir=DEFAULT_DRIVER_DIR, top=10):
+        self.classes_dir = classes_dir
+        self.driver_dir = driver_dir
+        self.top = top
+        self.compiled = None
+
+    def prepare(self):
+        """Compile the exporter once"""
+        if self.compiled is None:
+            self.compiled = compile_driver(["JfrExport.java"], self.classes_dir, self.driver_dir)
+        return self.compiled
+
+    def export(self, recording_path):
+        """Aggregated records for one recording"""
+        ok, msg = self.prepare()
+        if not ok:
+            raise RuntimeError(msg)
+        proc = run_driver("pdc.JfrExport", args=[recording_path],
+                          classpath=driver_classpath(self.classes_dir, self.driver_dir), timeout=120)
+        if proc.returncode != 0:
+            raise RuntimeError(f"JFR export failed: {proc.stderr.strip()[:200]}")
+        return parse_json_lines(proc.stdout)
+
+    def rank(self, records, kind, key, weight):
+        """Merge records of one kind by `key` and return the top entries by `weight`"""
+        merged = {}
+        for record in records:
+            if record["kind"] != kind:
+                continue
+            k = key(record)
+            entry = merged.setdefault(k, {"count": 0, "amount": 0})
+            entry["count"] += record["count"]
+            entry["amount"] += record["amount"]
+        ordered = sorted(merged.items(), key=lambda item: item[1][weight], reverse=True)
+        return ordered[:self.top]
+
+    def summarize(self, records):
+        """Top hot methods, contended locks and allocation sites"""
+        samples = sum(r["count"] for r in records if r["kind"] == "exec") or 1
+
+        def share(count):
+            return round(count * 100.0 / samples, 2)
+
+        return {
+            "execution_samples": samples if any(r["kind"] == "exec" for r in records) else 0,
+            "hot_methods": [
+                {"method": method, "samples": v["count"], "pct": share(v["count"])}
+                for method, v in self.rank(records, "exec", lambda r: r["top_frame"], "count")
+            ],
+            # The innermost submission frame pinpoints slow paths in Master/Worker/Message
+            "hot_pdc_methods": [
+                {"method": method, "samples": v["count"], "pct": share(v["count"])}
+                for method, v in self.rank(records, "exec", lambda r: r["pdc_frame"], "count")
+                if method
+            ],
+            "lock_contention": [
+                {"monitor": monitor or "<unknown>", "site": site or top, "events": v["count"],
+                 "blocked_ms": round(v["amount"] / 1e6, 3)}
+                for (monitor, site, top), v in self.rank(
+                    records, "lock", lambda r: (r["subject"], r["pdc_frame"], r["top_frame"]), "amount")
+            ],
+            "allocation_hotspots": [
+                {"class": cls or "<unknown>", "site": site or top, "samples": v["count"],
+                 "mb": round(v["amount"] / (1 << 20), 3)}
+                for (cls, site, top), v in self.rank(
+                    records, "alloc", lambda r: (r["subject"], r["pdc_frame"], r["top_frame"]), "amount")
+            ],
+        }
+
+    def summarize_file(self, recording_path):
+        return self.summarize(self.export(recording_path))
+
+
+if __name__ == "__main__":
+    import json
+
+    summarizer = JfrSummarizer()
+    for path in sys.argv[1:]:
+        print(f"=== {path} ===")
+        print(json.dumps(summarizer.summarize_file(path), indent=2))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+JVM configuration matrix benchmark.
+
+Reruns a fixed closed-loop workload against a fresh master/worker cluster for
+every combination of garbage collector, heap size and thread stack size, and
+reports throughput, latency percentiles and GC pauses per configuration.
+"""
+
+import itertools
+import os
+import sys
+import time
+
+from gc_log import parse_gc_events, pause_summary
+from integration_test import IntegrationTestHarness, base_port
+from java_driver import DEFAULT_DRIVER_DIR
+from stats import percentile
+from watchdog import deadline_passed
+from workload import WorkloadMix
+
+DEFAULT_CLASSPATH = "build/classes/java/main:build/resources/main"
+
+GC_FLAGS = {
+    "g1": "-XX:+UseG1GC",
+    "parallel": "-XX:+UseParallelGC",
+    "serial": "-XX:+UseSerialGC",
+}
+DEFAULT_GCS = ["g1", "parallel", "serial"]
+DEFAULT_HEAPS = ["256m", "1g"]
+DEFAULT_STACKS = ["256k", "1m"]
+
+# Every configuration sees the same task sequence
+WORKLOAD_CLASSES = {"matrix": ("MATRIX_MULTIPLY", 64, 1.0)}
+
+
+def config_name(gc, heap, stack):
+    return f"{gc}_heap{heap}_xss{stack}"
+
+
+def jvm_flags(gc, heap, stack):
+    return [GC_FLAGS[gc], f"-Xms{heap}", f"-Xmx{heap}", f"-Xss{stack}"]
+
+
+class JvmMatrixBenchmark:
+    def __init__(self, classpath=DEFAULT_CLASSPATH, gcs=None, heaps=None, stacks=None,
+                 tasks=300, concurrency=8, timeout=120.0, master_port=None,
+                 log_dir=os.path.join(DEFAULT_DRIVER_DIR, "jvm_matrix")):
+        self.classpath = classpath
+        self.gcs = gcs or DEFAULT_GCS
+        self.heaps = heaps or DEFAULT_HEAPS
+        self.stacks = stacks or DEFAULT_STACKS
+        self.tasks = tasks
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # One port per configuration, above the harness's own base port
+        self.master_port = master_port or base_port() + 1
+        self.log_dir = log_dir
+        self.errors = []
+
+    def run_workload(self, harness):
+        """Keep `concurrency` tasks in flight until `tasks` have been sent"""
+        mix = WorkloadMix(WORKLOAD_CLASSES)
+        task_ids = []
+        begin = time.time()
+        deadline = begin + self.timeout
+
+        while len(task_ids) < self.tasks and time.time() < deadline:
+            if len(task_ids) - len(harness.end_times) >= self.concurrency:
+                time.sleep(0.001)
+                continue
+            _, task_type, payload = mix.draw()
+            task_id = f'jvm-{len(task_ids)}'
+            if not harness.send_task(task_id, task_type, payload, verbose=False):
+                break
+            task_ids.append(task_id)
+
+        harness.wait_for(task_ids, max(0.0, deadline - time.time()))
+        finished = [harness.end_times[t] for t in task_ids if t in harness.end_times]
+        elapsed = (max(finished) - begin) if finished else None
+        return task_ids, elapsed
+
+    def gc_metrics(self, harness):
+        """Pause totals across all processes, plus the master's on its own"""
+        metrics = {"gc_count": 0, "gc_pause_total_ms": 0.0, "gc_pause_max_ms": 0.0}
+        for name, path in harness.gc_logs:
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    summary = pause_summary(parse_gc_events(f.read()))
+            except OSError:
+                continue
+            metrics["gc_count"] += summary["gc_count"]
+            metrics["gc_pause_total_ms"] = round(metrics["gc_pause_total_ms"] + summary["gc_pause_total_ms"], 3)
+            metrics["gc_pause_max_ms"] = max(metrics["gc_pause_max_ms"], summary["gc_pause_max_ms"])
+            if name == "master":
+                metrics["master_gc_pause_total_ms"] = summary["gc_pause_total_ms"]
+        return metrics
+
+    def run_config(self, index, gc, heap, stack):
+        """Start a cluster with one JVM configuration and drive the workload"""
+        name = config_name(gc, heap, stack)
+        harness = IntegrationTestHarness(
+            self.classpath,
+            master_port=self.master_port + index,
+            jvm_options=jvm_flags(gc, heap, stack),
+            gc_log_dir=os.path.join(self.log_dir, name),
+        )
+
+        # Kills the cluster if the grading run's deadline passes mid-workload
+        harness.watchdog.begin(name)
+        try:
+            if not harness.start_master() or not harness.start_workers() or not harness.connect_to_master():
+                raise RuntimeError("; ".join(harness.errors) or "cluster failed to start")
+            harness.start_response_listener()
+            task_ids, elapsed = self.run_workload(harness)
+        finally:
+            expired = harness.watchdog.end()["expired"]
+            harness.cleanup()
+        if expired:
+            raise RuntimeError("run deadline reached during the workload")
+
+        values = list(harness.latencies(task_ids).values())
+        metrics = {"sent": len(task_ids), "completed": len(values)}
+        if values and elapsed:
+            metrics.update({
+                "throughput_tasks_per_s": round(len(values) / elapsed, 3),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+            })
+        metrics.update(self.gc_metrics(harness))
+        return name, metrics
+
+    def run_all(self):
+        """Benchmark every (gc, heap, stack) combination"""
+        results = {"scenarios": {}, "errors": self.errors}
+        configs = list(itertools.product(self.gcs, self.heaps, self.stacks))
+
+        for index, (gc, heap, stack) in enumerate(configs):
+            if deadline_passed():
+                self.errors.append(f"Run deadline reached; skipped {len(configs) - index} configurations")
+                break
+            try:
+                name, metrics = self.run_config(index, gc, heap, stack)
+            except Exception as e:
+                self.errors.append(f"{config_name(gc, heap, stack)}: {e}")
+                continue
+            results["scenarios"][name] = metrics
+            print(f"[BENCH] jvm {name}: {metrics.get('throughput_tasks_per_s')} tasks/s, "
+                  f"p99 {metrics.get('p99_ms')} ms, GC pauses {metrics['gc_pause_total_ms']} ms")
+
+        # Only configurations that completed the whole workload are eligible
+        complete = {n: m for n, m in results["scenarios"].items()
+                    if m["completed"] == self.tasks and "p99_ms" in m}
+        if complete:
+            results["best_throughput"] = max(complete, key=lambda n: complete[n]["throughput_tasks_per_s"])
+            results["best_p99"] = min(complete, key=lambda n: complete[n]["p99_ms"])
+            print(f"[BENCH] jvm best throughput: {results['best_throughput']}, best p99: {results['best_p99']}")
+
+        return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="JVM configuration matrix benchmark")
+    parser.add_argument("--gc", type=str, help="Comma-separated collectors (g1,parallel,serial)")
+    parser.add_argument("--heap", type=str, help="Comma-separated heap sizes, e.g. 256m,1g")
+    parser.add_argument("--xss", type=str, help="Comma-separated thread stack sizes, e.g. 256k,1m")
+    parser.add_argument("--tasks", type=int, default=300, help="Tasks per configuration")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tasks kept in flight")
+    args = parser.parse_args()
+
+    def split(value):
+        return value.split(",") if value else None
+
+    benchmark = JvmMatrixBenchmark(gcs=split(args.gc), heaps=split(args.heap), stacks=split(args.xss),
+                                   tasks=args.tasks, concurrency=args.concurrency)
+    results = benchmark.run_all()
+    json.dump(results, sys.stdout, indent=2)
+    print()
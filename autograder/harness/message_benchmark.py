@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the submission's Message.pack()/unpack().
+Compiles MessageBenchmark.java against build/classes and runs one JVM per
+payload size, using the GC log to attribute allocations to each phase.
+"""
+
+import os
+import sys
+
+from java_driver import (
+    DEFAULT_CLASSES_DIR,
+    DEFAULT_DRIVER_DIR,
+    compile_driver,
+    driver_classpath,
+    parse_json_lines,
+    run_driver,
+)
+from gc_log import allocation_by_segment, parse_gc_events, pause_summary
+
+KB = 1 << 10
+MB = 1 << 20
+
+# 1 KB .. 64 MB in powers of four
+DEFAULT_PAYLOAD_SIZES = [KB * (4 ** i) for i in range(9)]
+
+# Bytes pushed through each timed phase; enough to dwarf GC log rounding (1 MB)
+TARGET_BYTES_PER_PHASE = 256 * MB
+MIN_ITERATIONS = 5
+MAX_ITERATIONS = 200000
+
+
+def size_label(size):
+    """Human label for a payload size, e.g. 4096 -> '4KB'"""
+    if size >= MB:
+        return f"{size // MB}MB"
+    return f"{size // KB}KB"
+
+
+class MessageBenchmark:
+    def __init__(self, classes_dir=DEFAULT_CLASSES_DIR, driver_dir=DEFAULT_DRIVER_DIR,
+                 sizes=None, heap="1g", timeout=600):
+        self.classes_dir = classes_dir
+        self.driver_dir = driver_dir
+        self.sizes = sizes or DEFAULT_PAYLOAD_SIZES
+        self.heap = heap
+        self.timeout = timeout
+        self.errors = []
+
+    def iterations_for(self, size):
+        """Timed iterations and warmup iterations for a payload size"""
+        iterations = max(MIN_ITERATIONS, min(MAX_ITERATIONS, TARGET_BYTES_PER_PHASE // size))
+        warmup = max(2, iterations // 10)
+        return iterations, warmup
+
+    def run_size(self, size):
+        """Benchmark a single payload size in a fresh JVM"""
+        iterations, warmup = self.iterations_for(size)
+        gc_log_path = os.path.join(self.driver_dir, f"message_bench_gc_{size}.log")
+        if os.path.exists(gc_log_path):
+            os.remove(gc_log_path)
+
+        jvm_options = [
+            f"-Xms{self.heap}",
+            f"-Xmx{self.heap}",
+            f"-Xlog:gc:file={gc_log_path}",
+        ]
+
+        proc = run_driver(
+            "pdc.MessageBenchmark",
+            args=[size, iterations, warmup],
+            jvm_options=jvm_options,
+            classpath=driver_classpath(self.classes_dir, self.driver_dir),
+            timeout=self.timeout,
+        )
+
+        records = parse_json_lines(proc.stdout)
+        if not records:
+            raise RuntimeError(f"no output from driver (exit {proc.returncode}): {proc.stderr.strip()[:200]}")
+        record = records[-1]
+        if "error" in record:
+            raise RuntimeError(record["error"])
+
+        with open(gc_log_path, "r", encoding="utf-8") as f:
+            events = parse_gc_events(f.read())
+        # Segments: warmup, pack, unpack (each closed by an explicit System.gc())
+        segments = allocation_by_segment(events)
+        pack_alloc = segments[1] if len(segments) > 1 else 0
+        unpack_alloc = segments[2] if len(segments) > 2 else 0
+
+        pack_s = record["pack_nanos"] / 1e9
+        unpack_s = record["unpack_nanos"] / 1e9
+        metrics = {
+            "payload_bytes": size,
+            "packed_bytes": record["packed_bytes"],
+            "iterations": iterations,
+            "pack_messages_per_s": round(iterations / pack_s, 2) if pack_s else None,
+            "pack_mb_per_s": round(iterations * size / MB / pack_s, 2) if pack_s else None,
+            "unpack_messages_per_s": round(iterations / unpack_s, 2) if unpack_s else None,
+            "unpack_mb_per_s": round(iterations * size / MB / unpack_s, 2) if unpack_s else None,
+            "pack_alloc_bytes_per_message": round(pack_alloc / iterations, 1),
+            "unpack_alloc_bytes_per_message": round(unpack_alloc / iterations, 1),
+        }
+        metrics.update(pause_summary(events))
+        return metrics
+
+    def run_all(self):
+        """Compile the driver and benchmark every payload size"""
+        results = {"scenarios": {}, "errors": self.errors}
+
+        ok, msg = compile_driver(["MessageBenchmark.java"], self.classes_dir, self.driver_dir)
+        if not ok:
+            self.errors.append(msg)
+            return results
+
+        for size in self.sizes:
+            label = size_label(size)
+            try:
+                metrics = self.run_size(size)
+                results["scenarios"][f"payload_{label}"] = metrics
+                print(f"[BENCH] Message {label}: pack {metrics['pack_mb_per_s']} MB/s, "
+                      f"unpack {metrics['unpack_mb_per_s']} MB/s")
+            except Exception as e:
+                self.errors.append(f"payload {label}: {e}")
+                print(f"[BENCH] Message {label}: FAILED ({e})")
+
+        return results
+
+
+if __name__ == "__main__":
+    import json
+
+    benchmark = MessageBenchmark()
+    results = benchmark.run_all()
+    json.dump(results, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded harness trace (integration_test.py --trace) against a
+master, at the recorded pace, N times faster, or as fast as possible.
+
+Every recorded connection is reopened and receives exactly the bytes it
+was sent originally, so two submissions (or two versions of one) can be
+compared on identical input. Latency is matched per task id and reported
+next to the latency seen when the trace was recorded.
+
+Usage:
+    python autograder/harness/replay.py TRACE [--speed 1|10|max] [--scenario NAME]
+    python autograder/harness/replay.py TRACE --launch      # start a cluster first
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+
+from integration_test import RESPONSE_TYPES, IntegrationTestHarness, base_port
+from stats import percentile
+from traffic_trace import decode_frame, load_trace
+
+
+def task_ids_in(frame):
+    """Task ids of the RPC requests in a sent frame (possibly several lines)"""
+    ids = []
+    for line in frame.split(b'\n'):
+        try:
+            msg = json.loads(line)
+            ids.append(str(msg["payload"]).split(';', 1)[0])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+    return ids
+
+
+def response_task_id(line):
+    try:
+        msg = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(msg, dict) or msg.get("messageType") not in RESPONSE_TYPES:
+        return None
+    return str(msg.get("payload", "")).split(';', 1)[0]
+
+
+def recorded_latencies(events):
+    """Per-task latency (s) as observed while recording
+
+    Task ids restart in every scenario, so tasks are keyed by (scenario, task id).
+    """
+    sent, done = {}, {}
+    for event in events:
+        scenario = event.get("scenario")
+        if event["d"] == "s":
+            for task_id in task_ids_in(decode_frame(event)):
+                sent.setdefault((scenario, task_id), event["t"])
+        else:
+            task_id = response_task_id(decode_frame(event))
+            if task_id is not None:
+                done.setdefault((scenario, task_id), event["t"])
+    return [done[t] - sent[t] for t in sent if t in done]
+
+
+def latency_report(prefix, values):
+    if not values:
+        return {}
+    return {
+        f"{prefix}p50_ms": round(percentile(values, 50) * 1000, 3),
+        f"{prefix}p95_ms": round(percentile(values, 95) * 1000, 3),
+        f"{prefix}p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+class TraceReplayer:
+    def __init__(self, host="localhost", port=None, speed=1.0, drain_timeout=30.0):
+        self.host = host
+        self.port = port or base_port()
+        # None replays at maximum speed
+        self.speed = speed
+        self.drain_timeout = drain_timeout
+        self.sockets = {}
+        # Keyed by (scenario, task id): ids restart in every recorded scenario
+        self.start_times = {}
+        self.end_times = {}
+        self.scenario = None
+        self.received_lines = 0
+        self.errors = []
+        self.lock = threading.Lock()
+
+    def listen(self, sock):
+        try:
+            for line in sock.makefile('rb'):
+                task_id = response_task_id(line)
+                with self.lock:
+                    self.received_lines += 1
+                    if task_id is not None:
+                        self.end_times.setdefault((self.scenario, task_id), time.time())
+        except OSError:
+            pass
+
+    def connection(self, number):
+        """Socket for a recorded connection, opened on first use"""
+        if number not in self.sockets:
+            sock = socket.create_connection((self.host, self.port), timeout=10)
+            sock.settimeout(None)
+            self.sockets[number] = sock
+            threading.Thread(target=self.listen, args=(sock,), daemon=True).start()
+        return self.sockets[number]
+
+    def drain(self, deadline):
+        """Wait until every task sent so far has a response, or the deadline"""
+        while time.time() < deadline:
+            with self.lock:
+                if all(t in self.end_times for t in self.start_times):
+                    return
+            time.sleep(0.01)
+
+    def replay(self, events):
+        sends = [e for e in events if e["d"] == "s"]
+        if not sends:
+            return {"frames": 0}
+
+        origin = sends[0]["t"]
+        begin = time.time()
+        frames = sent_bytes = 0
+        for event in sends:
+            if self.speed:
+                delay = begin + (event["t"] - origin) / self.speed - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            scenario = event.get("scenario")
+            if scenario != self.scenario:
+                # Scenarios were recorded one after another; finish this one before
+                # its task ids are reused, so late responses are not credited to the next
+                self.drain(time.time() + self.drain_timeout)
+                with self.lock:
+                    self.scenario = scenario
+            frame = decode_frame(event)
+            now = time.time()
+            for task_id in task_ids_in(frame):
+                self.start_times.setdefault((scenario, task_id), now)
+            try:
+                self.connection(event["c"]).sendall(frame)
+            except OSError as e:
+                # The master dropped this connection (e.g. after malformed frames); later frames reconnect
+                self.errors.append(f"connection {event['c']}: {e}")
+                self.sockets.pop(event["c"], None)
+                continue
+            frames += 1
+            sent_bytes += len(frame)
+        send_s = time.time() - begin
+
+        self.drain(time.time() + self.drain_timeout)
+        elapsed = time.time() - begin
+
+        for sock in self.sockets.values():
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+        latencies = [self.end_times[t] - self.start_times[t] for t in self.start_times if t in self.end_times]
+        finished = [self.end_times[t] for t in self.start_times if t in self.end_times]
+        report = {
+            "speed": self.speed or "max",
+            "frames": frames,
+            "sent_bytes": sent_bytes,
+            "tasks": len(self.start_times),
+            "completed": len(latencies),
+            "responses": self.received_lines,
+            "recorded_duration_s": round(sends[-1]["t"] - origin, 3),
+            "send_s": round(send_s, 3),
+        }
+        if finished:
+            report["throughput_tasks_per_s"] = round(len(finished) / max(1e-9, max(finished) - begin), 3)
+        report.update(latency_report("", latencies))
+        report.update(latency_report("recorded_", recorded_latencies(events)))
+        report["drain_s"] = round(elapsed - send_s, 3)
+        return report
+
+
+def parse_speed(value):
+    return None if value == "max" else float(value)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Replay a recorded harness trace against a master')
+    parser.add_argument('trace', help='Trace written by integration_test.py --trace')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help="Time scale: 1, 10, ... or 'max'")
+    parser.add_argument('--scenario', type=str, help='Replay only this recorded scenario')
+    parser.add_argument('--host', type=str, default='localhost')
+    parser.add_argument('--port', type=int, help='Master port (default: CSM218_PORT_BASE or 9999)')
+    parser.add_argument('--launch', action='store_true', help='Start master and workers from build/ before replaying')
+    parser.add_argument('--drain-timeout', type=float, default=30.0, help='Seconds to wait for outstanding responses')
+    parser.add_argument('--output', type=str, help='Write the replay report as JSON to this path')
+    args = parser.parse_args()
+
+    header, events = load_trace(args.trace, args.scenario)
+    print(f"[REPLAY] {len(events)} events from {args.trace}"
+          f"{' (' + args.scenario + ')' if args.scenario else ''} at {args.speed or 'max'}x")
+
+    harness = None
+    if args.launch:
+        harness = IntegrationTestHarness("build/classes/java/main:build/resources/main", master_port=args.port)
+        if not harness.start_master() or not harness.start_workers():
+            print(f"[REPLAY] Cluster failed to start: {harness.errors}")
+            harness.cleanup()
+            return 1
+
+    replayer = TraceReplayer(args.host, args.port or (harness.master_port if harness else None),
+                             args.speed, args.drain_timeout)
+    try:
+        report = replayer.replay(events)
+    finally:
+        if harness:
+            harness.cleanup()
+
+    report["errors"] = replayer.errors
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Small statistics helpers shared by the harness scenarios (stdlib only).
+"""
+
+import math
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0..100) of a sequence"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def linear_fit(xs, ys):
+    """
+    Least-squares fit y = slope * x + intercept.
+    Returns (slope, intercept, r_squared), or None with fewer than 3 points.
+    """
+    n = len(xs)
+    if n < 3 or n != len(ys):
+        return None
+
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    if sxx == 0:
+        return None
+
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    r_squared = (sxy * sxy) / (sxx * syy) if syy else 1.0
+    return slope, intercept, r_squared
+
+
+def jain_index(values):
+    """Jain's fairness index: 1.0 when all values are equal, 1/n at worst"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    total = sum(values)
+    squares = sum(v * v for v in values)
+    if squares == 0:
+        return None
+    return (total * total) / (len(values) * squares)
+
+
+def median(values):
+    return percentile(values, 50)
+
+
+def bootstrap_ci(values, statistic=median, confidence=0.95, resamples=2000, seed=218):
+    """Percentile bootstrap confidence interval (low, high) for a statistic"""
+    import random
+
+    values = list(values)
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0], values[0]
+
+    rng = random.Random(seed)
+    estimates = sorted(
+        statistic([rng.choice(values) for _ in values]) for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
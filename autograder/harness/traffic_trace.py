@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compact traces of harness protocol traffic for record and replay.
+
+A trace is gzip-compressed JSON lines. The first line is a header; every
+other line is an event with short keys:
+    t  seconds since the trace started
+    c  connection number (in order of first use)
+    d  "s" for bytes the harness sent, "r" for a line it received
+    m  the frame text (or "b": base64 when it is not valid UTF-8)
+Scenario boundaries are recorded as {"t": ..., "scenario": name}.
+"""
+
+import base64
+import gzip
+import json
+import threading
+import time
+
+TRACE_VERSION = 1
+
+
+def encode_frame(data):
+    """Frame bytes/str as a trace field: text when possible, base64 otherwise"""
+    if isinstance(data, str):
+        return {"m": data}
+    try:
+        return {"m": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b": base64.b64encode(data).decode("ascii")}
+
+
+def decode_frame(event):
+    if "b" in event:
+        return base64.b64decode(event["b"])
+    return event["m"].encode("utf-8")
+
+
+class TraceRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.begin = time.time()
+        self.lock = threading.Lock()
+        self.connections = {}
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.write({"trace": TRACE_VERSION, "started": self.begin})
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def connection(self, sock):
+        if sock not in self.connections:
+            self.connections[sock] = len(self.connections)
+        return self.connections[sock]
+
+    def record(self, sock, direction, data):
+        """Log one send ('send') or received line ('recv') on a connection"""
+        with self.lock:
+            if self.file is None:
+                return
+            event = {"t": round(time.time() - self.begin, 6), "c": self.connection(sock),
+                     "d": "s" if direction == "send" else "r"}
+            event.update(encode_frame(data))
+            self.write(event)
+
+    def mark(self, scenario):
+        with self.lock:
+            if self.file is not None:
+                self.write({"t": round(time.time() - self.begin, 6), "scenario": scenario})
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def load_trace(path, scenario=None):
+    """Header and events of a trace, optionally limited to one scenario"""
+    header = None
+    events = []
+    current = None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if header is None:
+                header = record
+            elif "scenario" in record:
+                current = record["scenario"]
+            elif scenario is None or current == scenario:
+                record["scenario"] = current
+                events.append(record)
+    return header, events
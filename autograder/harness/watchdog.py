@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Wall-clock budgets for harness scenarios and for a whole grading run.
+
+When a scenario outlives its budget (or the run outlives its deadline) the
+watchdog calls `on_expire`, which kills every process group the harness
+spawned, so a hung submission cannot hold a grading slot. Scenarios that
+would start after the run deadline are skipped.
+
+Time reclaimed is what the slot would otherwise have spent: the budget of
+each skipped scenario, plus for each expired scenario the run time that was
+still left when it was killed (a hung JVM would have held the slot at least
+that long).
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+
+# Absolute run deadline (epoch seconds) handed down by grade.py
+DEADLINE_ENV = "CSM218_DEADLINE"
+
+
+def env_deadline():
+    try:
+        return float(os.environ[DEADLINE_ENV])
+    except (KeyError, ValueError):
+        return None
+
+
+def deadline_passed():
+    deadline = env_deadline()
+    return deadline is not None and time.time() >= deadline
+
+
+def bounded_timeout(timeout):
+    """`timeout` capped at the time left before the run deadline"""
+    deadline = env_deadline()
+    if deadline is None:
+        return timeout
+    return max(0.0, min(timeout, deadline - time.time()))
+
+
+def run_in_group(cmd, timeout, **kwargs):
+    """
+    subprocess.run() in a new process group that is killed as a whole on
+    timeout (capped by the run deadline) or interruption.
+    """
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                          start_new_session=True, **kwargs) as proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=bounded_timeout(timeout))
+        except BaseException:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.communicate()
+            raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+class Watchdog:
+    def __init__(self, on_expire, run_budget=None, scenario_budget=None, deadline=None):
+        self.on_expire = on_expire
+        self.scenario_budget = scenario_budget
+        self.started = time.time()
+
+        deadlines = [d for d in (deadline, env_deadline()) if d]
+        if run_budget:
+            deadlines.append(self.started + run_budget)
+        self.run_deadline = min(deadlines) if deadlines else None
+
+        self.lock = threading.Lock()
+        self.timer = None
+        self.current = None
+        self.records = []
+
+    def remaining(self):
+        """Seconds left in the run, or None when the run is unbounded"""
+        if self.run_deadline is None:
+            return None
+        return max(0.0, self.run_deadline - time.time())
+
+    def reclaimable(self, budget):
+        """Time given back by killing a scenario now
+
+        A hung scenario would hold the run for at least another scenario budget,
+        but never longer than the run has left; without a scenario budget it
+        would hold the rest of the run.
+        """
+        limits = [t for t in (budget, self.remaining()) if t is not None]
+        return min(limits) if limits else 0.0
+
+    def run_expired(self):
+        return self.run_deadline is not None and time.time() >= self.run_deadline
+
+    def expired(self):
+        """True once the current scenario was killed or the run deadline passed"""
+        with self.lock:
+            current = self.current
+        return bool(current and current['expired']) or self.run_expired()
+
+    def begin(self, name, budget=None):
+        """Start timing a scenario; it is killed after min(budget, run time left)"""
+        budget = budget or self.scenario_budget
+        now = time.time()
+        limits = [now + budget] if budget else []
+        if self.run_deadline is not None:
+            limits.append(self.run_deadline)
+
+        with self.lock:
+            self.current = {'scenario': name, 'budget_s': budget, 'started': now, 'expired': False}
+            if limits:
+                self.timer = threading.Timer(max(0.0, min(limits) - now), self.expire)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def expire(self):
+        with self.lock:
+            record = self.current
+            if record is None or record['expired']:
+                return
+            record['expired'] = True
+            record['reclaimed_s'] = round(self.reclaimable(record['budget_s']), 3)
+        print(f"[WATCHDOG] {record['scenario']} exceeded its budget; killing spawned processes")
+        record['killed_groups'] = self.on_expire()
+
+    def end(self):
+        """Stop timing the current scenario and return its record"""
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            record, self.current = self.current, None
+        if record is None:
+            return None
+        record['elapsed_s'] = round(time.time() - record.pop('started'), 3)
+        self.records.append(record)
+        return record
+
+    def skip(self, name, budget=None):
+        """Record a scenario not started because the run deadline passed"""
+        budget = budget or self.scenario_budget
+        record = {'scenario': name, 'budget_s': budget, 'skipped': True, 'reclaimed_s': budget or 0.0}
+        self.records.append(record)
+        print(f"[WATCHDOG] Run deadline reached; skipping {name}")
+        return record
+
+    def report(self):
+        return {
+            'run_budget_s': round(self.run_deadline - self.started, 3) if self.run_deadline else None,
+            'elapsed_s': round(time.time() - self.started, 3),
+            'expired': [r['scenario'] for r in self.records if r.get('expired')],
+            'skipped': [r['scenario'] for r in self.records if r.get('skipped')],
+            'reclaimed_s': round(sum(r.get('reclaimed_s', 0.0) for r in self.records), 3),
+            'scenarios': self.records,
+        }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Byte accounting for harness traffic.
+
+WireCounter tallies bytes and frames per direction and message type.
+WireProxy is a TCP relay placed between workers and the master so the
+worker link, whose framing is the submission's own Message.pack(), can be
+measured without touching it. Frames are typed by their JSON messageType
+when they are newline-delimited JSON; anything else is counted as
+"<unframed>" but still included in the byte totals.
+"""
+
+import json
+import socket
+import threading
+
+UNFRAMED = "<unframed>"
+
+# Partial frames longer than this are counted without waiting for a newline
+MAX_PENDING = 1 << 20
+
+
+def frame_type(line):
+    try:
+        msg = json.loads(line)
+    except ValueError:
+        return UNFRAMED
+    if isinstance(msg, dict) and msg.get("messageType"):
+        return str(msg["messageType"])
+    return UNFRAMED
+
+
+class WireCounter:
+    """
+    Snapshots look like {direction: {"bytes": total, "types": {type: {"frames", "bytes"}}}}.
+    Byte totals include data whose frame has not completed (or never will,
+    for binary framing); types only cover complete lines.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+        self.pending = {}
+
+    def feed(self, stream, direction, data):
+        """Count bytes from `stream` (any hashable key), typing complete lines"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with self.lock:
+            entry = self.counts.setdefault(direction, {"bytes": 0, "types": {}})
+            entry["bytes"] += len(data)
+            buffer = self.pending.get(stream, b"") + data
+            *lines, rest = buffer.split(b"\n")
+            for line in lines:
+                self.add_frame(entry, frame_type(line), len(line) + 1)
+            if len(rest) > MAX_PENDING:
+                self.add_frame(entry, UNFRAMED, len(rest))
+                rest = b""
+            self.pending[stream] = rest
+
+    @staticmethod
+    def add_frame(entry, kind, nbytes):
+        frame = entry["types"].setdefault(kind, {"frames": 0, "bytes": 0})
+        frame["frames"] += 1
+        frame["bytes"] += nbytes
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                direction: {"bytes": entry["bytes"], "types": {k: dict(v) for k, v in entry["types"].items()}}
+                for direction, entry in self.counts.items()
+            }
+
+    @staticmethod
+    def delta(after, before):
+        """Counts accumulated between two snapshots"""
+        result = {}
+        for direction, entry in after.items():
+            prev = before.get(direction, {"bytes": 0, "types": {}})
+            nbytes = entry["bytes"] - prev["bytes"]
+            if not nbytes:
+                continue
+            types = {}
+            for kind, frame in entry["types"].items():
+                old = prev["types"].get(kind, {"frames": 0, "bytes": 0})
+                if frame["bytes"] != old["bytes"]:
+                    types[kind] = {"frames": frame["frames"] - old["frames"], "bytes": frame["bytes"] - old["bytes"]}
+            result[direction] = {"bytes": nbytes, "types": types}
+        return result
+
+    @staticmethod
+    def total(counts, direction, kind=None):
+        entry = counts.get(direction, {"bytes": 0, "types": {}})
+        if kind is not None:
+            return entry["types"].get(kind, {}).get("bytes", 0)
+        return entry["bytes"]
+
+
+class WireProxy:
+    """Relays connections from `listen_host` (ephemeral port) to the master, counting bytes"""
+
+    def __init__(self, listen_host, target_host, target_port, counter):
+        self.listen_host = listen_host
+        self.target_host = target_host
+        self.target_port = target_port
+        self.counter = counter
+        self.server = None
+        self.port = None
+        self.connections = []
+        self.running = False
+
+    def start(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((self.listen_host, 0))
+        self.server.listen(128)
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+        return self.port
+
+    def accept_loop(self):
+        while self.running:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            try:
+                upstream = socket.create_connection((self.target_host, self.target_port), timeout=10)
+                upstream.settimeout(None)
+            except OSError:
+                client.close()
+                continue
+            self.connections += [client, upstream]
+            threading.Thread(target=self.pump, args=(client, upstream, "worker_to_master"), daemon=True).start()
+            threading.Thread(target=self.pump, args=(upstream, client, "master_to_worker"), daemon=True).start()
+
+    def pump(self, src, dst, direction):
+        try:
+            while True:
+                data = src.recv(65536)
+                if not data:
+                    break
+                self.counter.feed(src, direction, data)
+                dst.sendall(data)
+        except OSError:
+            pass
+        finally:
+            # Half-close so the other side sees EOF just as it would without the proxy
+            try:
+                dst.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    def stop(self):
+        self.running = False
+        for sock in [self.server] + self.connections:
+            try:
+                sock.close()
+            except (OSError, AttributeError):
+                pass
+        self.connections = []
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Workload generation for harness scenarios: matrix payloads in the harness
+text encoding (columns ',' rows '\\' operands '|'), weighted task mixes and
+memory-mapped .npy operands for matrices too large to build in memory.
+"""
+
+import ast
+import mmap
+import os
+import random
+import sys
+from array import array
+
+# name -> (task type, matrix dimension, relative frequency)
+DEFAULT_SIZE_CLASSES = {
+    "small": ("MATRIX_MULTIPLY", 2, 0.90),
+    "large": ("MATRIX_MULTIPLY", 256, 0.05),
+    "transpose": ("BLOCK_TRANSPOSE", 128, 0.05),
+}
+
+
+def encode_matrix(matrix):
+    """Encode a list of rows as '1,2\\3,4'"""
+    return '\\'.join(','.join(str(v) for v in row) for row in matrix)
+
+
+def random_matrix(n, rng, max_value=10):
+    return [[rng.randrange(max_value) for _ in range(n)] for _ in range(n)]
+
+
+def task_payload(task_type, n, rng):
+    """Payload for one task: two operands for multiply, one for transpose"""
+    if task_type == "BLOCK_TRANSPOSE":
+        return encode_matrix(random_matrix(n, rng))
+    return encode_matrix(random_matrix(n, rng)) + '|' + encode_matrix(random_matrix(n, rng))
+
+
+def matrix_elements(payload):
+    """Number of matrix elements encoded in a payload"""
+    if not payload:
+        return 0
+    return payload.count(',') + payload.count('\\') + payload.count('|') + 1
+
+
+class WorkloadMix:
+    """Draws (size class, task type, payload) tuples according to class weights"""
+
+    def __init__(self, size_classes=None, seed=218, variants=4):
+        self.size_classes = size_classes or DEFAULT_SIZE_CLASSES
+        self.rng = random.Random(seed)
+        # Large payloads are expensive to build; pre-generate a few per class
+        self.payloads = {
+            name: [task_payload(task_type, n, self.rng) for _ in range(variants)]
+            for name, (task_type, n, _) in self.size_classes.items()
+        }
+        self.names = list(self.size_classes)
+        self.weights = [self.size_classes[name][2] for name in self.names]
+
+    def draw(self, only=None):
+        """Next task; `only` restricts the draw to the given class names"""
+        if only:
+            names = [n for n in self.names if n in only]
+            weights = [self.size_classes[n][2] for n in names]
+        else:
+            names, weights = self.names, self.weights
+        name = self.rng.choices(names, weights)[0]
+        task_type = self.size_classes[name][0]
+        return name, task_type, self.rng.choice(self.payloads[name])
+
+
+# Matrices too large to build as Python strings are written to disk as
+# int32 .npy files (no numpy needed) and encoded straight from an mmap, one
+# block of rows at a time, so the harness never holds a whole operand.
+
+NPY_MAGIC = b"\x93NUMPY"
+NPY_DTYPE = "<i4"
+NPY_ITEMSIZE = 4
+
+# Byte value -> ASCII digit for single-digit values
+ASCII_DIGITS = bytes((i + 48) & 0xFF for i in range(256))
+
+
+def npy_header(shape):
+    """Version 1.0 .npy header for a C-ordered little-endian int32 array"""
+    fields = "{'descr': '%s', 'fortran_order': False, 'shape': (%s), }" % (
+        NPY_DTYPE, ", ".join(str(d) for d in shape) + ("," if len(shape) == 1 else ""))
+    # Magic (6) + version (2) + length (2) + header, padded to a multiple of 64
+    pad = 64 - (10 + len(fields) + 1) % 64
+    text = fields + " " * (pad % 64) + "\n"
+    return NPY_MAGIC + b"\x01\x00" + len(text).to_bytes(2, "little") + text.encode("latin1")
+
+
+def write_random_npy(path, n, rng, max_value=10):
+    """Write a random n x n int32 matrix row by row; values in [0, max_value)"""
+    if max_value > 10:
+        raise ValueError("write_random_npy draws single digits (max_value <= 10)")
+    table = bytes(i % max_value for i in range(256))
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(npy_header((n, n)))
+        row = bytearray(n * NPY_ITEMSIZE)
+        for _ in range(n):
+            # Little-endian int32 of a small value is (v, 0, 0, 0)
+            row[0::NPY_ITEMSIZE] = rng.randbytes(n).translate(table)
+            f.write(row)
+    os.replace(tmp, path)
+    return path
+
+
+class NpyMatrix:
+    """Read-only mmap of a 2-D int32 .npy matrix"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        prefix = self.file.read(10)
+        if prefix[:6] != NPY_MAGIC or prefix[6] != 1:
+            raise ValueError(f"{path}: not a version 1 .npy file")
+        header_len = int.from_bytes(prefix[8:10], "little")
+        header = ast.literal_eval(self.file.read(header_len).decode("latin1"))
+        if header["descr"] != NPY_DTYPE or header["fortran_order"] or len(header["shape"]) != 2:
+            raise ValueError(f"{path}: expected a C-ordered 2-D {NPY_DTYPE} array, got {header}")
+
+        self.rows, self.cols = header["shape"]
+        self.offset = 10 + header_len
+        self.row_bytes = self.cols * NPY_ITEMSIZE
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def elements(self):
+        return self.rows * self.cols
+
+    def row_values(self, start, stop):
+        """array('i') of rows [start, stop) in row-major order"""
+        values = array("i")
+        values.frombytes(self.map[self.offset + start * self.row_bytes:self.offset + stop * self.row_bytes])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def release(self, stop):
+        """Drop mapped pages before row `stop` so streamed rows leave our RSS"""
+        end = (self.offset + stop * self.row_bytes) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > 0 and hasattr(self.map, "madvise"):
+            self.map.madvise(mmap.MADV_DONTNEED, 0, end)
+
+    def encode_rows(self, values, count):
+        """Harness text for `count` rows, each followed by the row separator"""
+        if values and min(values) >= 0 and max(values) < 10:
+            # Single digits: interleave ASCII digits and separators at C speed
+            low = 0 if sys.byteorder == "little" else NPY_ITEMSIZE - 1
+            text = bytearray(len(values) * 2)
+            text[0::2] = values.tobytes()[low::NPY_ITEMSIZE].translate(ASCII_DIGITS)
+            text[1::2] = (b"," * (self.cols - 1) + b"\\") * count
+            return text
+        rows = (values[r * self.cols:(r + 1) * self.cols] for r in range(count))
+        return bytearray("".join(",".join(map(str, row)) + "\\" for row in rows).encode("ascii"))
+
+    def encoded_chunks(self, rows_per_chunk=64):
+        """The harness text encoding ('1,2\\3,4') of the matrix, in blocks of rows"""
+        for start in range(0, self.rows, rows_per_chunk):
+            stop = min(self.rows, start + rows_per_chunk)
+            text = self.encode_rows(self.row_values(start, stop), stop - start)
+            if stop == self.rows:
+                # No separator after the last row
+                del text[-1]
+            yield bytes(text)
+            self.release(stop)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Local performance history for CSM218 grading runs.
+
+Every run's numeric metrics (phase timings, benchmark and harness scenario
+results) are stored in SQLite keyed by commit and scenario, so that a later
+run can be compared against the previous N runs for regressions.
+
+Usage:
+    python autograder/history.py record results.json [--commit SHA]
+    python autograder/history.py compare [--last N] [--alpha 0.05]
+    python autograder/history.py list
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    commit_sha TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    scenario TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_by_key ON metrics (scenario, metric, run_id);
+"""
+
+# Metric name suffixes deciding which direction is a regression. Higher is
+# checked first (pack_mb_per_s also ends in "_s"); metrics matching neither
+# are stored but not compared.
+HIGHER_IS_BETTER = (
+    "_per_s", "throughput", "throughput_p50", "speedup", "success_ratio", "throughput_ratio",
+    "dip_ratio", "fairness", "_connections", "saving_pct",
+)
+LOWER_IS_BETTER = (
+    "_ms", "_s", "_mb", "_mb_per_min", "_bytes", "_bytes_per_element", "_bytes_per_message",
+    "overhead_ratio", "drift_ratio", "degradation", "inflation", "gc_count", "_failed",
+    "_drops", "_stalls",
+)
+# Summary statistics appended to a metric name, e.g. four_tasks_ms_median
+STAT_SUFFIXES = ("_median", "_ci_low", "_ci_high")
+# Names whose suffix would mislead: inputs, configured budgets, and results
+# named after what they compare against. "*" entries match as a suffix.
+METRIC_DIRECTIONS = {
+    "speedup_vs_one_worker": 1,
+    "speedup_vs_reference": 1,
+    "jain_fairness_normalized": 1,
+    "tasks_per_size": 0,
+    "frame_rate": 0,
+    "*_offered_per_s": 0,
+    "deadline_s": 0,
+    "run_budget_s": 0,
+    "budget_s": 0,
+    "duration_s": 0,
+    "recorded_duration_s": 0,
+    "payload_bytes": 0,
+    "read_rate_bytes": 0,
+}
+
+
+def metric_direction(metric):
+    """+1 if higher is better, -1 if lower is better, 0 if not comparable"""
+    for stat in STAT_SUFFIXES:
+        if metric.endswith(stat):
+            metric = metric[:-len(stat)]
+            break
+    for name, direction in METRIC_DIRECTIONS.items():
+        if metric == name or (name.startswith("*") and metric.endswith(name[1:])):
+            return direction
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def incomplete_beta(a, b, x):
+    """Regularized incomplete beta function I_x(a, b) (continued fraction)"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    # The continued fraction converges quickly only below the mean
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - incomplete_beta(b, a, 1.0 - x)
+
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    f = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            f *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return front * f
+
+
+def t_upper_tail(t, df):
+    """P(T > t) for Student's t with df degrees of freedom, t >= 0"""
+    return 0.5 * incomplete_beta(df / 2, 0.5, df / (df + t * t))
+
+
+def t_critical(df, alpha):
+    """One-sided Student t critical value: P(T > t) = alpha"""
+    if not 0.0 < alpha < 0.5:
+        raise ValueError(f"alpha must be in (0, 0.5), got {alpha}")
+    low, high = 0.0, 1.0
+    while t_upper_tail(high, df) > alpha:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if t_upper_tail(mid, df) > alpha:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def collect_metrics(results):
+    """Flatten numeric metrics from a results.json into (scenario, metric, value)"""
+    rows = []
+
+    def add(scenario, metrics):
+        for metric, value in metrics.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rows.append((scenario, metric, float(value)))
+
+    add("grade", results.get("timings", {}))
+    for bench_name, bench in results.get("benchmarks", {}).items():
+        for scenario, metrics in bench.get("scenarios", {}).items():
+            add(f"{bench_name}/{scenario}", metrics)
+    for scenario, metrics in results.get("scenarios", {}).items():
+        if isinstance(metrics, dict):
+            add(scenario, metrics)
+
+    return rows
+
+
+def current_commit(repo_dir="."):
+    """Commit being graded: GITHUB_SHA in CI, otherwise git HEAD"""
+    if os.environ.get("GITHUB_SHA"):
+        return os.environ["GITHUB_SHA"]
+    try:
+        proc = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_dir,
+                              capture_output=True, text=True, timeout=10)
+        if proc.returncode == 0:
+            return proc.stdout.strip()
+    except Exception:
+        pass
+    return "unknown"
+
+
+class PerformanceHistory:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record_run(self, results, commit, source="grade"):
+        """Store every numeric metric of a run; returns the new run id"""
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (commit_sha, recorded_at, source) VALUES (?, ?, ?)",
+                (commit, time.time(), source),
+            )
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO metrics (run_id, scenario, metric, value) VALUES (?, ?, ?, ?)",
+                [(run_id, s, m, v) for s, m, v in collect_metrics(results)],
+            )
+        return run_id
+
+    def list_runs(self, limit=20):
+        return self.conn.execute(
+            "SELECT r.id, r.commit_sha, r.recorded_at, r.source, COUNT(m.metric) "
+            "FROM runs r LEFT JOIN metrics m ON m.run_id = r.id "
+            "GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def compare(self, last_n=5, alpha=0.05, min_change=0.05, run_id=None):
+        """
+        Compare a run (default: the latest) against the previous `last_n`
+        runs that reported the same scenario/metric. A metric regresses when
+        it falls outside the one-sided prediction interval of the history
+        and moved by at least `min_change` relative to the historical mean.
+        """
+        if run_id is None:
+            row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+            run_id = row[0]
+        if run_id is None:
+            return []
+
+        regressions = []
+        current = self.conn.execute(
+            "SELECT scenario, metric, value FROM metrics WHERE run_id = ?", (run_id,)
+        ).fetchall()
+
+        for scenario, metric, value in current:
+            direction = metric_direction(metric)
+            if direction == 0:
+                continue
+
+            history = [v for (v,) in self.conn.execute(
+                "SELECT value FROM metrics WHERE scenario = ? AND metric = ? AND run_id < ? "
+                "ORDER BY run_id DESC LIMIT ?",
+                (scenario, metric, run_id, last_n),
+            )]
+            if len(history) < 2:
+                continue
+
+            n = len(history)
+            mean = sum(history) / n
+            sd = math.sqrt(sum((v - mean) ** 2 for v in history) / (n - 1))
+            margin = t_critical(n - 1, alpha) * sd * math.sqrt(1 + 1 / n)
+            # Positive `worse` means the metric moved in the bad direction
+            worse = (mean - value) if direction > 0 else (value - mean)
+            relative = worse / abs(mean) if mean else (math.inf if worse > 0 else 0.0)
+
+            if worse > margin and relative >= min_change:
+                regressions.append({
+                    "scenario": scenario,
+                    "metric": metric,
+                    "value": value,
+                    "history_mean": round(mean, 4),
+                    "history_sd": round(sd, 4),
+                    "history_runs": n,
+                    "change": round(relative, 4),
+                })
+
+        return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSM218 performance history")
+    parser.add_argument("--db", default=os.environ.get("CSM218_HISTORY_DB", DEFAULT_DB_PATH),
+                        help="SQLite database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Record a results.json (grade or harness output)")
+    record.add_argument("results", help="Path to a results JSON file")
+    record.add_argument("--commit", help="Commit SHA (default: GITHUB_SHA or git HEAD)")
+    record.add_argument("--source", default="manual", help="Label for where the run came from")
+
+    compare = sub.add_parser("compare", help="Flag regressions of the latest run")
+    compare.add_argument("--last", type=int, default=5, help="Number of previous runs to compare against")
+    compare.add_argument("--alpha", type=float, default=0.05, help="One-sided significance level")
+    compare.add_argument("--min-change", type=float, default=0.05, help="Minimum relative change to report")
+
+    sub.add_parser("list", help="Show recent runs")
+    args = parser.parse_args()
+    if args.command == "compare" and not 0.0 < args.alpha < 0.5:
+        parser.error("--alpha must be between 0 and 0.5")
+
+    history = PerformanceHistory(args.db)
+    try:
+        if args.command == "record":
+            with open(args.results, "r") as f:
+                results = json.load(f)
+            run_id = history.record_run(results, args.commit or current_commit(), args.source)
+            print(f"Recorded run {run_id}")
+
+        elif args.command == "compare":
+            regressions = history.compare(args.last, args.alpha, args.min_change)
+            if not regressions:
+                print("No significant regressions")
+                return 0
+            for r in regressions:
+                print(f"[REGRESSION] {r['scenario']}::{r['metric']} = {r['value']:.4g} "
+                      f"(mean {r['history_mean']:.4g} over {r['history_runs']} runs, "
+                      f"{r['change'] * 100:+.1f}% worse)")
+            return 1
+
+        elif args.command == "list":
+            for run_id, commit, recorded_at, source, count in history.list_runs():
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(recorded_at))
+                print(f"{run_id:5d}  {commit[:12]:12s}  {stamp}  {source:10s}  {count} metrics")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
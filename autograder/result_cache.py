@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of per-suite results for the CSM218 autograder.
+A suite is only re-executed when the files it reads or its own module change.
+"""
+
+import json
+import os
+import sys
+
+# input_hash lives with the harness, which also uses it
+HARNESS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "harness")
+if HARNESS_DIR not in sys.path:
+    sys.path.append(HARNESS_DIR)
+
+from input_hash import hash_file, hash_inputs
+
+CACHE_VERSION = 1
+
+# Files each suite inspects, as glob patterns relative to the submission root.
+# Suites not listed here fall back to DEFAULT_INPUTS. Injected suites such as
+# SystemConsistency are deliberately absent: what they read is not known here.
+SUITE_INPUTS = {
+    "RPC": [
+        "src/main/java/pdc/Master.java",
+        "src/main/java/pdc/Worker.java",
+        "src/main/java/pdc/Message.java",
+        "build/classes/java/main/pdc/Message.class",
+    ],
+    "Parallel": [
+        "src/main/java/pdc/Master.java",
+        "src/main/java/pdc/Worker.java",
+    ],
+    "Failure": [
+        "src/main/java/pdc/Master.java",
+        "src/main/java/pdc/Worker.java",
+    ],
+    "Protocol": [
+        "src/**/*.java",
+    ],
+    "Concurrency": [
+        "src/main/java/pdc/Master.java",
+        "src/main/java/pdc/Worker.java",
+    ],
+    "Advanced": [
+        "src/main/java/pdc/Message.java",
+    ],
+}
+
+DEFAULT_INPUTS = [
+    "src/**/*.java",
+]
+
+
+class SuiteResultCache:
+    def __init__(self, cache_path, submission_dir):
+        self.cache_path = cache_path
+        self.submission_dir = submission_dir
+        self.entries = {}
+        self.hits = []
+        self.misses = []
+        self.load()
+
+    def load(self):
+        """Load cached entries, discarding the file if it is unreadable"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("suites", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Persist entries atomically so an interrupted run never corrupts the cache"""
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "suites": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def key_for(self, suite_name, module_path):
+        """Cache key: (hash of the suite's inputs, hash of the suite module)"""
+        patterns = SUITE_INPUTS.get(suite_name, DEFAULT_INPUTS)
+        inputs_hash = hash_inputs(self.submission_dir, patterns)
+        module_hash = hash_file(module_path) if module_path and os.path.exists(module_path) else "<unknown>"
+        return f"{inputs_hash}:{module_hash}"
+
+    def get(self, suite_name, key):
+        """Return cached results for suite_name if its key is unchanged"""
+        entry = self.entries.get(suite_name)
+        if entry and entry.get("key") == key:
+            self.hits.append(suite_name)
+            return entry["results"]
+
+        self.misses.append(suite_name)
+        return None
+
+    def put(self, suite_name, key, results):
+        """
+        Store the raw run_all() results for suite_name. Static verdicts, passed
+        or failed, depend only on the hashed inputs and are cached. Dynamic
+        results depend on the machine and harness, and skipped (unscored)
+        results mark an infrastructure error, so neither is.
+        """
+        if any(r.get("type") == "dynamic" or r.get("skipped") for r in results.values()):
+            self.entries.pop(suite_name, None)
+            return
+        self.entries[suite_name] = {"key": key, "results": results}
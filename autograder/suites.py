@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Lazy registry of autograder test suites.
+
+Suites are discovered by name from autograder/tests/test_*.py without
+importing them; a suite module is only imported when that suite is run.
+"""
+
+import ast
+import importlib
+import os
+import sys
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")
+
+# module -> (suite name, class), in grading order. The hidden module is
+# injected by CI and simply absent locally.
+KNOWN_SUITES = {
+    "test_rpc_basic": ("RPC", "AutograderTest"),
+    "test_parallel_execution": ("Parallel", "ParallelExecutionTest"),
+    "test_failure_handling": ("Failure", "FailureHandlingTest"),
+    "test_protocol_structure": ("Protocol", "ProtocolStructureTest"),
+    "test_concurrency": ("Concurrency", "ConcurrencyTest"),
+    "test_advanced_protocol": ("Advanced", "AdvancedProtocolTest"),
+    "test_performance_baseline": ("Performance", "PerformanceBaselineTest"),
+    "test_hidden_robustness": ("SystemConsistency", "HiddenRobustnessTest"),
+}
+
+
+class SuiteSpec:
+    def __init__(self, name, module, class_name, path):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.path = path
+
+    def load(self):
+        """Import the suite module and instantiate its test class"""
+        if TESTS_DIR not in sys.path:
+            sys.path.insert(0, TESTS_DIR)
+        module = importlib.import_module(self.module)
+        return getattr(module, self.class_name)()
+
+
+def find_suite_class(path):
+    """Name of the first class in a module that defines run_all(), or None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError):
+        return None
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            if any(isinstance(item, ast.FunctionDef) and item.name == "run_all" for item in node.body):
+                return node.name
+    return None
+
+
+class SuiteRegistry:
+    def __init__(self, tests_dir=TESTS_DIR):
+        self.tests_dir = tests_dir
+        self.suites = self.discover()
+
+    def discover(self):
+        """Map suite name -> SuiteSpec for every test module present on disk"""
+        try:
+            files = sorted(f for f in os.listdir(self.tests_dir) if f.startswith("test_") and f.endswith(".py"))
+        except OSError:
+            files = []
+
+        modules = {f[:-3]: os.path.join(self.tests_dir, f) for f in files}
+        suites = {}
+
+        # Known suites keep their historical order and names
+        for module, (name, class_name) in KNOWN_SUITES.items():
+            if module in modules:
+                suites[name] = SuiteSpec(name, module, class_name, modules.pop(module))
+
+        # Anything else is named after its suite class, e.g. FooTest -> Foo
+        for module, path in modules.items():
+            class_name = find_suite_class(path)
+            if not class_name:
+                continue
+            name = class_name[:-4] if class_name.endswith("Test") and len(class_name) > 4 else class_name
+            suites.setdefault(name, SuiteSpec(name, module, class_name, path))
+
+        return suites
+
+    def names(self):
+        return list(self.suites)
+
+    def get(self, name):
+        return self.suites.get(name)
+
+    def select(self, name=None):
+        """All suites, or only the named one (empty if unknown)"""
+        if name is None:
+            return list(self.suites.values())
+        spec = self.suites.get(name)
+        return [spec] if spec else []
@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+
+AUTOGRADER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+HARNESS_DIR = os.path.join(AUTOGRADER_DIR, "harness")
+if HARNESS_DIR not in sys.path:
+    sys.path.append(HARNESS_DIR)
+
+from integration_test import CONFIG_PATH, IntegrationTestHarness
+
+CLASSPATH = "build/classes/java/main:build/resources/main"
+
+class PerformanceBaselineTest:
+    def __init__(self, config_path=CONFIG_PATH):
+        with open(config_path, "r") as f:
+            config = json.load(f)["autograder_config"]
+        self.baseline = config["performance_baseline"]
+        self.tolerance = self.baseline.get("tolerance", 0.0)
+        # The suite's entry in test_suites bounds the whole measurement
+        self.budget = next((s["timeout"] for s in config["test_suites"] if s["name"] == "Performance Baseline"), None)
+        self.harness = IntegrationTestHarness(CLASSPATH)
+        self.summary = None
+        self.error = None
+        # Infrastructure problems (no JVM, no cluster) are not the submission's fault
+        self.unscored = False
+
+    def measure(self):
+        """Launch the cluster once and time single-task and four-task runs"""
+        if self.summary is not None or self.error is not None:
+            return
+        harness = self.harness
+        harness.watchdog.begin("Performance Baseline", self.budget)
+        try:
+            if not harness.start_master() or not harness.start_workers() or not harness.connect_to_master():
+                self.error = "; ".join(harness.errors) or "Cluster failed to start"
+                self.unscored = True
+                return
+            harness.start_response_listener()
+            samples = harness.run_repeated_timings(self.baseline.get("runs", 5), self.baseline.get("warmup", 1))
+            self.summary = harness.summarize_timings(samples)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            if harness.watchdog.end()["expired"]:
+                self.error = f"Timing runs exceeded the {self.budget}s budget"
+            harness.cleanup()
+
+    def verdict_unavailable(self):
+        """(passed, message) when there is nothing to grade, else None"""
+        self.measure()
+        if self.error:
+            return (None if self.unscored else False), self.error
+        return None
+
+    def test_single_task_latency(self):
+        """Median single-task latency lies within the range (scaled like grade_parallelism)"""
+        unavailable = self.verdict_unavailable()
+        if unavailable:
+            return unavailable
+        single = self.summary.get("single_task_ms")
+        if not single:
+            return False, "No single task completed"
+
+        scale = self.harness.baseline_scale(self.summary, self.baseline)
+        low = self.baseline["single_task_min_ms"] * scale * (1 - self.tolerance)
+        high = self.baseline["single_task_max_ms"] * scale * (1 + self.tolerance)
+        measured = f"median {single['median']:.0f} ms over {single['n']} runs"
+        if scale != 1.0:
+            measured += f", bounds scaled x{scale:.2f} to the single-task median"
+        if single["median"] < low:
+            # Faster than the task's own work allows: it was not really executed
+            return False, f"Single task implausibly fast ({measured} < {low:.0f} ms)"
+        if single["median"] > high:
+            return False, f"Single task too slow ({measured} > {high:.0f} ms)"
+        return True, f"Single task within baseline ({measured}, range {low:.0f}-{high:.0f} ms)"
+
+    def test_four_task_parallel_latency(self):
+        """Four concurrent tasks finish within the parallel makespan bound"""
+        unavailable = self.verdict_unavailable()
+        if unavailable:
+            return unavailable
+        # None (interval straddles the bounds) is left unscored rather than guessed
+        return self.harness.grade_parallelism(self.summary, self.baseline, self.tolerance)
+
+    def result(self, success, msg, weight):
+        """Suite result; a None verdict is reported as not scored (weight 0)"""
+        if success is None:
+            return {"passed": False, "message": f"Not scored: {msg}", "weight": 0, "type": "dynamic", "skipped": True}
+        return {"passed": success, "message": msg, "weight": weight, "type": "dynamic"}
+
+    def run_all(self):
+        """Run all performance baseline tests"""
+        results = {}
+
+        success, msg = self.test_single_task_latency()
+        results["single_task_latency"] = self.result(success, msg, 0.05)
+
+        success, msg = self.test_four_task_parallel_latency()
+        results["four_task_parallel_latency"] = self.result(success, msg, 0.05)
+
+        return results
+
+if __name__ == "__main__":
+    tester = PerformanceBaselineTest()
+    results = tester.run_all()
+
+    for test_name, result in results.items():
+        status = "SKIP" if result.get("skipped") else ("PASS" if result["passed"] else "FAIL")
+        print(f"{test_name}: {status} - {result['message']}")
@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from history import metric_direction, t_critical
+
+# Every metric name the harness scenarios and benchmarks emit (formatted names
+# expanded with representative values), with the direction that is an improvement
+EMITTED_METRICS = {
+    # grade.py timings
+    "compile_s": -1, "tests_s": -1, "benchmarks_s": -1, "total_s": -1,
+    # message benchmark
+    "pack_mb_per_s": 1, "unpack_mb_per_s": 1, "pack_messages_per_s": 1, "unpack_messages_per_s": 1,
+    "pack_alloc_bytes_per_message": -1, "unpack_alloc_bytes_per_message": -1, "packed_bytes": -1,
+    "payload_bytes": 0,
+    # coordinate benchmark
+    "coordinate_ms": -1, "reference_ms": -1, "speedup_vs_one_worker": 1, "speedup_vs_reference": 1,
+    # JVM matrix
+    "throughput_tasks_per_s": 1, "p50_ms": -1, "p95_ms": -1, "p99_ms": -1, "gc_count": -1,
+    "gc_pause_total_ms": -1, "gc_pause_max_ms": -1, "master_gc_pause_total_ms": -1,
+    # parallelism (repeated timings)
+    "single_task_ms_median": -1, "four_tasks_ms_ci_high": -1, "start_spread_s_median": -1,
+    "speedup_median": 1, "speedup_n": 0, "four_tasks_ms_n": 0,
+    # startup / CDS
+    "master_startup_ms": -1, "master_startup_cds_ms": -1, "startup_saving_pct": 1,
+    # soak
+    "latency_p50_ms": -1, "latency_p99_ms": -1, "latency_drift_ratio": -1,
+    "master_rss_growth_mb_per_min": -1, "master_rss_final_mb": -1, "worker-0_rss_growth_mb_per_min": -1,
+    # churn
+    "baseline_throughput": 1, "worst_dip_ratio": 1, "max_recovery_s": -1,
+    # connection scaling
+    "c100_success_ratio": 1, "c100_completed_connections": 1, "c100_connect_failed": -1,
+    "c100_connect_p99_ms": -1, "c100_first_response_p99_ms": -1,
+    "c100_per_connection_throughput_p50": 1, "c100_aggregate_throughput": 1,
+    "max_stable_connections": 1, "collapse_connections": 1,
+    # malformed-frame flood
+    "frame_rate": 0, "baseline_valid_sent": 0, "flood_valid_completed": 0, "flood_drops": -1,
+    "flood_stalls": -1, "flood_throughput": 1, "flood_latency_p99_ms": -1, "latency_p99_degradation": -1,
+    # slow consumer
+    "master_send_q_max_bytes": -1, "submit_blocked_s": -1, "read_rate_bytes": 0,
+    # head-of-line blocking
+    "mixed_small_p99_ms": -1, "mixed_small_p99_inflation": -1, "throughput_ratio": 1,
+    # fairness
+    "tenant-a_offered_per_s": 0, "tenant-a_throughput": 1, "tenant-a_p99_ms": -1,
+    "jain_fairness_throughput": 1, "jain_fairness_normalized": 1,
+    # wire efficiency
+    "tasks_per_size": 0, "n16_client_bytes": -1, "n16_client_bytes_per_element": -1,
+    "n16_worker_bytes_per_element": -1, "n16_client_overhead_ratio": -1, "n16_worker_link_bytes": -1,
+    # large matrices
+    "harness_rss_growth_mb": -1, "harness_rss_peak_mb": -1, "send_mb_per_s": 1,
+    # replay
+    "send_s": -1, "drain_s": -1, "recorded_p99_ms": -1, "recorded_duration_s": 0,
+    # watchdog
+    "elapsed_s": -1, "reclaimed_s": -1, "run_budget_s": 0, "deadline_s": 0,
+}
+
+
+def test_emitted_metric_directions():
+    wrong = {
+        name: (metric_direction(name), expected)
+        for name, expected in EMITTED_METRICS.items()
+        if metric_direction(name) != expected
+    }
+    assert not wrong, f"(got, expected) per metric: {wrong}"
+
+
+def test_t_critical_matches_table():
+    # One-sided Student t quantiles at alpha = 0.05 and 0.01
+    assert round(t_critical(1, 0.05), 3) == 6.314
+    assert round(t_critical(4, 0.05), 3) == 2.132
+    assert round(t_critical(30, 0.05), 3) == 1.697
+    assert round(t_critical(4, 0.01), 3) == 3.747